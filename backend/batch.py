@@ -0,0 +1,40 @@
+"""
+Offline batch processing of conversations.
+
+Reads a JSONL file of conversations ({"id": "...", "messages": ["turn 1", "turn 2"]}),
+runs them concurrently through isolated chat sessions and streams results to a JSONL
+file. Re-running with the same output file resumes where the previous run stopped.
+
+Usage:
+    python batch.py conversations.jsonl results.jsonl --concurrency 16
+"""
+import argparse
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from chatbot_setup import create_chat_session
+from core.batch import BatchRunner
+
+
+async def main(input_path: str, output_path: str, concurrency: int) -> None:
+    # LLM calls run in worker threads; size the pool so it never caps concurrency
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=concurrency + 4))
+    chat_session = create_chat_session()
+    await chat_session.initialize()
+    await chat_session.warm_up()
+    try:
+        progress = await BatchRunner(chat_session, concurrency=concurrency).run(input_path, output_path)
+        logging.info(f"Batch finished: {json.dumps(progress.to_dict())}")
+    finally:
+        await chat_session.cleanup_servers()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("input", help="JSONL file of conversations")
+    parser.add_argument("output", help="JSONL file results are appended to")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.input, args.output, args.concurrency))
@@ -0,0 +1,165 @@
+"""
+Embedding backend benchmark.
+
+Compares ingestion throughput, per-query latency and recall@k of embedding backends and
+index storage precisions against the full-precision PyTorch / float32 baseline, on the
+sample docs.json (with labelled questions) and on a larger synthetic corpus of distinct
+sentences queried with questions that never appear in it verbatim. Run it from the backend directory:
+
+    python benchmarks/embedding_benchmark.py --onnx-dir models/all-MiniLM-L6-v2-onnx --synthetic 20000
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Dict, List
+
+import faiss
+import numpy as np
+
+sys.path.insert(0, ".")
+from vector_stores.embedders.base import Embedder  # noqa: E402
+from vector_stores.embedders.onnx_embedder import ONNXEmbedder  # noqa: E402
+from vector_stores.embedders.sentence_transformer import SentenceTransformerEmbedder  # noqa: E402
+from vector_stores.collections import INDEX_QUANTIZERS  # noqa: E402
+
+SUBJECTS = ["The national park", "A historic castle", "The river delta", "An alpine lake",
+            "The coral reef", "A desert canyon", "The old lighthouse", "A volcanic island",
+            "The cathedral", "A mountain pass", "The salt marsh", "An ancient forest",
+            "The fishing village", "A limestone cave", "The botanical garden", "A frozen fjord"]
+VERBS = ["attracts", "is home to", "was shaped by", "is known for", "protects", "borders",
+         "shelters", "was named after", "is threatened by", "draws visitors for", "overlooks",
+         "depends on"]
+OBJECTS = ["migrating birds", "ancient glaciers", "rare orchids", "granite cliffs",
+           "seasonal floods", "thousands of hikers", "a colonial fort", "hot springs",
+           "wild horses", "copper mines", "sea turtles", "a medieval market", "giant sequoias",
+           "lava tubes", "fruit orchards", "a Roman aqueduct"]
+DETAILS = ["every summer", "since the 1800s", "along its northern edge", "after heavy rain",
+           "despite its remote location", "according to local records", "during the winter months",
+           "at low tide", "for most of the year", "on clear nights", "near the border",
+           "in recent decades"]
+PLACES = ["in Patagonia", "in Norway", "in Japan", "in Morocco", "in Peru", "in Scotland",
+          "in Iceland", "in Kenya", "in Tasmania", "in Quebec"]
+
+# questions about the sample docs.json, with the index of the document that answers each
+SAMPLE_QUERIES = [
+    ("When was the Eiffel Tower finished?", 0),
+    ("What is a famous landmark in Paris?", 0),
+    ("How long is the Great Wall?", 1),
+    ("Which fortifications protected ancient China from invaders?", 1),
+    ("What is the highest peak in the world?", 2),
+    ("How tall is the tallest mountain in the Himalayas?", 2),
+    ("Which rainforest has the most biodiversity?", 3),
+    ("What forest helps regulate the global climate?", 3),
+    ("What is the deepest ocean?", 4),
+    ("How big is the Pacific?", 4),
+]
+
+
+def synthetic_corpus(size: int, seed: int = 0) -> List[str]:
+    """Distinct sentences, so that nearest neighbours are not exact ties."""
+    rng = random.Random(seed)
+    corpus = set()
+    while len(corpus) < size:
+        corpus.add(f"{rng.choice(SUBJECTS)} {rng.choice(PLACES)} {rng.choice(VERBS)} "
+                   f"{rng.choice(OBJECTS)} {rng.choice(DETAILS)}.")
+    return sorted(corpus)
+
+
+def synthetic_queries(size: int, seed: int = 1) -> List[str]:
+    """Questions written in a different form from the corpus sentences, so none matches one exactly."""
+    rng = random.Random(seed)
+    templates = ["Where can I see {obj} {place}?", "Which places {place} are known for {obj}?",
+                 "Tell me about {subj} and its {obj}.", "What was affected by {obj} {place} {detail}?"]
+    return [rng.choice(templates).format(
+                subj=rng.choice(SUBJECTS).split(" ", 1)[1], obj=rng.choice(OBJECTS),
+                place=rng.choice(PLACES), detail=rng.choice(DETAILS))
+            for _ in range(size)]
+
+
+def build_index(vectors: np.ndarray, dtype: str) -> faiss.Index:
+    if dtype in INDEX_QUANTIZERS:
+        index = faiss.IndexScalarQuantizer(vectors.shape[1], INDEX_QUANTIZERS[dtype], faiss.METRIC_L2)
+        index.train(vectors)
+    else:
+        index = faiss.IndexFlatL2(vectors.shape[1])
+    index.add(vectors)
+    return index
+
+
+def run(name: str, embedder: Embedder, dtype: str, corpus: List[str], queries: List[str],
+        top_k: int, baseline_ids: np.ndarray = None, expected: List[int] = None) -> Dict:
+    embedder.load()
+    start = time.perf_counter()
+    vectors = embedder.encode(corpus)
+    ingest_seconds = time.perf_counter() - start
+    index = build_index(vectors, dtype)
+
+    latencies = []
+    ids = []
+    for query in queries:
+        start = time.perf_counter()
+        _, found = index.search(embedder.encode([query]), top_k)
+        latencies.append(time.perf_counter() - start)
+        ids.append(found[0])
+    ids = np.array(ids)
+
+    recall = 1.0
+    if baseline_ids is not None:
+        recall = float(np.mean([len(set(a) & set(b)) / top_k for a, b in zip(ids, baseline_ids)]))
+
+    result = {
+        "backend": name,
+        "dtype": dtype,
+        "docs_per_second": len(corpus) / ingest_seconds,
+        "query_p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "query_p95_ms": float(np.percentile(latencies, 95) * 1000),
+        "index_bytes": faiss.serialize_index(index).nbytes,
+        f"recall@{top_k}": recall,
+        "ids": ids,
+    }
+    if expected is not None:
+        # share of questions whose labelled answer is the top hit
+        result["accuracy@1"] = float(np.mean(ids[:, 0] == np.array(expected)))
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--onnx-dir", help="directory produced by vector_stores.embedders.export_onnx")
+    parser.add_argument("--synthetic", type=int, default=10000, help="size of the synthetic corpus")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+
+    with open("docs.json", "r") as f:
+        sample = [doc["text"] for doc in json.load(f)]
+    # corpus name -> (documents, queries, labelled answers or None)
+    corpora = {
+        "docs.json": (sample, [q for q, _ in SAMPLE_QUERIES], [i for _, i in SAMPLE_QUERIES]),
+        f"synthetic-{args.synthetic}": (synthetic_corpus(args.synthetic),
+                                        synthetic_queries(args.queries), None),
+    }
+
+    configs = [("pytorch", SentenceTransformerEmbedder(num_threads=args.threads), "float32"),
+               ("pytorch", SentenceTransformerEmbedder(num_threads=args.threads), "float16"),
+               ("pytorch", SentenceTransformerEmbedder(num_threads=args.threads), "int8")]
+    if args.onnx_dir:
+        for dtype in ["float32", "float16", "int8"]:
+            configs.append(("onnx-int8", ONNXEmbedder(args.onnx_dir, intra_op_threads=args.threads), dtype))
+
+    for corpus_name, (corpus, queries, expected) in corpora.items():
+        # recall against the baseline is trivially 1.0 when top_k covers the whole corpus
+        top_k = min(args.top_k, max(1, len(corpus) // 2))
+        print(f"\n== {corpus_name} ({len(corpus)} docs, {len(queries)} queries)")
+        baseline = None
+        for name, embedder, dtype in configs:
+            result = run(name, embedder, dtype, corpus, queries, top_k,
+                         baseline["ids"] if baseline else None, expected)
+            baseline = baseline or result
+            print(json.dumps({k: v for k, v in result.items() if k != "ids"}))
+
+if __name__ == "__main__":
+    main()
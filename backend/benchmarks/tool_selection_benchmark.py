@@ -0,0 +1,54 @@
+"""
+Tool selection report.
+
+Builds a ToolIndex over the fixture tool catalogue and reports, for each top-k setting,
+the selection recall on labelled queries and the system prompt tokens saved per turn
+compared to exposing the full catalogue. Run it from the backend directory:
+
+    python benchmarks/tool_selection_benchmark.py --top-k 3 5 8
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, ".")
+from core.server import Tool  # noqa: E402
+from core.session import ChatSession  # noqa: E402
+from core.tool_index import ToolIndex  # noqa: E402
+from helpers import estimate_tokens  # noqa: E402
+from vector_stores.embedders.factory import get_embedder  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "tool_selection.json")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--fixture", default=FIXTURE)
+    parser.add_argument("--top-k", type=int, nargs="+", default=[3, 5, 8])
+    parser.add_argument("--min-score", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with open(args.fixture, "r") as f:
+        fixture = json.load(f)
+    tools = [Tool(t["name"], t["description"], t["inputSchema"]) for t in fixture["tools"]]
+    cases = fixture["cases"]
+    full_tokens = estimate_tokens(ChatSession._build_system_message(tools))
+
+    embedder = get_embedder(os.getenv("EMBEDDING_BACKEND", None))
+    print(f"{len(tools)} tools, {len(cases)} queries, full prompt ~{full_tokens} tokens")
+    for top_k in args.top_k:
+        index = ToolIndex(embedder, top_k=top_k, min_score=args.min_score)
+        index.build(tools)
+        saved = [full_tokens - estimate_tokens(ChatSession._build_system_message(index.select(c["query"], tools)))
+                 for c in cases]
+        print(json.dumps({
+            "top_k": top_k,
+            "recall": round(index.recall(cases, tools), 3),
+            "avg_prompt_tokens_saved": round(sum(saved) / len(saved)),
+            "avg_prompt_tokens_saved_pct": round(100 * sum(saved) / len(saved) / full_tokens, 1),
+        }))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
+import json
 import os
 from helpers import load_config_with_env
-from core import Configuration, Server, LLMClient, ChatSession
+from core import Configuration, Server, LLMClient, ChatSession, SidecarClient, SidecarServer, ToolIndex, ToolResultProcessor
+from conversation_stores.factory import get_conversation_store
 from vector_stores.factory import get_vector_store
+from vector_stores.embedders.factory import get_embedder
 from vector_stores.loaders.factory import get_document_loader
 
 
@@ -16,8 +19,15 @@ def create_chat_session() -> ChatSession:
     """
     config = Configuration()
     server_config = load_config_with_env('servers_config.json')
-    servers = [Server(name, srv_config)
-               for name, srv_config in server_config['mcpServers'].items()]
+    sidecar_socket = os.getenv("MCP_SIDECAR_SOCKET", None)
+    if sidecar_socket:
+        # MCP servers run once per host in mcp_sidecar.py; workers only hold a socket connection
+        sidecar_client = SidecarClient(sidecar_socket)
+        servers = [SidecarServer(name, sidecar_client)
+                   for name in server_config['mcpServers']]
+    else:
+        servers = [Server(name, srv_config)
+                   for name, srv_config in server_config['mcpServers'].items()]
     llm_client = LLMClient(
         provider=config.provider,
         api_key=config.api_key,
@@ -27,7 +37,37 @@ def create_chat_session() -> ChatSession:
     vector_store_provider = os.getenv("VECTOR_STORE_PROVIDER", None)
     vector_data_path = os.getenv("VECTOR_STORE_PATH", None)
     vector_data_format = os.getenv("VECTOR_STORE_FORMAT", None)
+    vector_index_path = os.getenv("VECTOR_STORE_INDEX_PATH", None)
     document_loader = get_document_loader(vector_data_format)
+    embedder = get_embedder(os.getenv("EMBEDDING_BACKEND", None))
     vector_store = get_vector_store(
-        vector_store_provider, loader=document_loader, path=vector_data_path)
-    return ChatSession(servers, llm_client, vector_store)
+        vector_store_provider, loader=document_loader, path=vector_data_path, index_path=vector_index_path,
+        embedder=embedder, dtype=os.getenv("VECTOR_STORE_DTYPE") or "float32",
+        max_active_collections=int(os.getenv("VECTOR_STORE_MAX_ACTIVE_COLLECTIONS") or "4"))
+    # additional named collections, ex. {"parks": {"path": "parks.pdf", "format": "pdf"}}
+    collections = json.loads(os.getenv("VECTOR_STORE_COLLECTIONS") or "{}")
+    if collections and not hasattr(vector_store, "add_collection"):
+        raise ValueError(
+            f"VECTOR_STORE_COLLECTIONS is not supported by vector store provider: {vector_store_provider}")
+    for name, collection in collections.items():
+        vector_store.add_collection(
+            name,
+            loader=get_document_loader(collection.get("format", vector_data_format)),
+            path=collection["path"],
+            index_path=collection.get("index_path"))
+    conversation_store = get_conversation_store(
+        os.getenv("CONVERSATION_STORE_PROVIDER", None), os.getenv("CONVERSATION_STORE_URL", None))
+    tool_selection_top_k = os.getenv("TOOL_SELECTION_TOP_K", None)
+    tool_index = ToolIndex(
+        embedder,
+        top_k=int(tool_selection_top_k),
+        min_score=float(os.getenv("TOOL_SELECTION_MIN_SCORE") or "0.2")
+    ) if tool_selection_top_k else None
+    result_processor = ToolResultProcessor(
+        conversation_store,
+        default_budget=int(os.getenv("TOOL_RESULT_TOKEN_BUDGET") or "1000"),
+        budgets=json.loads(os.getenv("TOOL_RESULT_BUDGETS") or "{}"),
+        projections=json.loads(os.getenv("TOOL_RESULT_PROJECTIONS") or "{}"),
+        truncation=os.getenv("TOOL_RESULT_TRUNCATION") or "head"
+    )
+    return ChatSession(servers, llm_client, vector_store, conversation_store, tool_index, result_processor)
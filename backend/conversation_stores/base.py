@@ -0,0 +1,49 @@
+from abc import ABC, abstractmethod
+from typing import List, Dict
+
+
+class ConversationStore(ABC):
+    """
+    Abstract base class for conversation state storage.
+
+    Conversation history lives outside the process so that any worker or replica
+    can serve any turn of any conversation without sticky routing.
+    """
+    @abstractmethod
+    def load(self, conversation_id: str) -> List[Dict[str, str]]:
+        """
+        Load the message history for a conversation.
+
+        Args:
+            conversation_id (str): Identifier of the conversation.
+
+        Returns:
+            The list of stored messages in insertion order, or an empty list
+            if the conversation does not exist yet.
+        """
+        pass
+
+    @abstractmethod
+    def append(self, conversation_id: str, messages: List[Dict[str, str]]) -> None:
+        """
+        Append one or more messages to a conversation.
+
+        Args:
+            conversation_id (str): Identifier of the conversation.
+            messages (List[Dict[str, str]]): Messages formatted as {"role": ..., "content": ...}.
+        """
+        pass
+
+    @abstractmethod
+    def clear(self, conversation_id: str) -> None:
+        """
+        Delete all stored messages for a conversation.
+
+        Args:
+            conversation_id (str): Identifier of the conversation.
+        """
+        pass
+
+    def close(self) -> None:
+        """Release any resources (connections, file handles) held by the store."""
+        pass
@@ -0,0 +1,30 @@
+import os
+from typing import Optional
+from .base import ConversationStore
+from .memory import InMemoryConversationStore
+
+
+def get_conversation_store(provider: Optional[str] = None, url: Optional[str] = None) -> ConversationStore:
+    """
+    Factory method for creating a conversation store.
+
+    Args:
+        provider (Optional[str]): 'memory' (default), 'sqlite' or 'redis'.
+        url (Optional[str]): Database file path for SQLite or connection URL for Redis.
+
+    Returns:
+        An instance of a class that implements ConversationStore.
+    """
+    provider = (provider or "memory").lower()
+    if provider == "memory":
+        return InMemoryConversationStore()
+    elif provider == "sqlite":
+        from .sqlite_store import SQLiteConversationStore
+        return SQLiteConversationStore(path=url or "conversations.db")
+    elif provider == "redis":
+        from .redis_store import RedisConversationStore
+        ttl = os.getenv("CONVERSATION_STORE_TTL")
+        return RedisConversationStore(url=url or "redis://localhost:6379/0",
+                                      ttl_seconds=int(ttl) if ttl else None)
+    else:
+        raise ValueError(f"Unsupported conversation store provider: {provider}")
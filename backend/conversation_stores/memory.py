@@ -0,0 +1,29 @@
+import threading
+from collections import defaultdict
+from typing import List, Dict
+from conversation_stores.base import ConversationStore
+
+
+class InMemoryConversationStore(ConversationStore):
+    """
+    Keeps conversations in a process-local dictionary.
+
+    Suitable for single-worker development only; history is lost on restart and
+    is not visible to other workers.
+    """
+
+    def __init__(self):
+        self._conversations: Dict[str, List[Dict[str, str]]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def load(self, conversation_id: str) -> List[Dict[str, str]]:
+        with self._lock:
+            return list(self._conversations.get(conversation_id, []))
+
+    def append(self, conversation_id: str, messages: List[Dict[str, str]]) -> None:
+        with self._lock:
+            self._conversations[conversation_id].extend(messages)
+
+    def clear(self, conversation_id: str) -> None:
+        with self._lock:
+            self._conversations.pop(conversation_id, None)
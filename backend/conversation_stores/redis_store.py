@@ -0,0 +1,48 @@
+import json
+from typing import List, Dict, Optional
+from conversation_stores.base import ConversationStore
+
+
+class RedisConversationStore(ConversationStore):
+    """
+    Stores conversations as Redis lists, one list per conversation.
+
+    Works with any Redis-compatible server (Redis, Valkey, KeyDB); docker-compose
+    ships a local Valkey container as a stand-in for development.
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", ttl_seconds: Optional[int] = None,
+                 key_prefix: str = "mcp-chatbot:conversation:"):
+        """
+        Args:
+            url (str): Redis connection URL.
+            ttl_seconds (Optional[int]): Expire idle conversations after this many seconds.
+            key_prefix (str): Prefix applied to every conversation key.
+        """
+        import redis  # imported lazily so the dependency is only needed when selected
+
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+
+    def _key(self, conversation_id: str) -> str:
+        return f"{self.key_prefix}{conversation_id}"
+
+    def load(self, conversation_id: str) -> List[Dict[str, str]]:
+        return [json.loads(m) for m in self.client.lrange(self._key(conversation_id), 0, -1)]
+
+    def append(self, conversation_id: str, messages: List[Dict[str, str]]) -> None:
+        if not messages:
+            return
+        key = self._key(conversation_id)
+        pipe = self.client.pipeline()
+        pipe.rpush(key, *[json.dumps(m) for m in messages])
+        if self.ttl_seconds:
+            pipe.expire(key, self.ttl_seconds)
+        pipe.execute()
+
+    def clear(self, conversation_id: str) -> None:
+        self.client.delete(self._key(conversation_id))
+
+    def close(self) -> None:
+        self.client.close()
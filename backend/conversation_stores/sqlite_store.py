@@ -0,0 +1,69 @@
+import json
+import sqlite3
+import threading
+from typing import List, Dict
+from conversation_stores.base import ConversationStore
+
+
+class SQLiteConversationStore(ConversationStore):
+    """
+    Stores conversations in a SQLite database file.
+
+    The database runs in WAL mode so that several uvicorn workers on the same host
+    can read and append concurrently. Each thread gets its own connection.
+    """
+
+    def __init__(self, path: str = "conversations.db"):
+        """
+        Args:
+            path (str): Path to the SQLite database file. Created if missing.
+        """
+        self.path = path
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS messages (
+                   seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                   conversation_id TEXT NOT NULL,
+                   message TEXT NOT NULL
+               )"""
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_messages_conversation ON messages (conversation_id, seq)")
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def load(self, conversation_id: str) -> List[Dict[str, str]]:
+        rows = self._connection().execute(
+            "SELECT message FROM messages WHERE conversation_id = ? ORDER BY seq",
+            (conversation_id,)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def append(self, conversation_id: str, messages: List[Dict[str, str]]) -> None:
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "INSERT INTO messages (conversation_id, message) VALUES (?, ?)",
+                [(conversation_id, json.dumps(m)) for m in messages]
+            )
+
+    def clear(self, conversation_id: str) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "DELETE FROM messages WHERE conversation_id = ?", (conversation_id,))
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -2,6 +2,10 @@ from .config import Configuration
 from .server import Server, Tool
 from .llm import LLMClient
 from .session import ChatSession
+from .sidecar import SidecarClient, SidecarServer
+from .tool_index import ToolIndex
+from .tool_results import ToolResultProcessor
+from .admission import AdmissionController, AdmissionRejected
 import logging
 
 logging.basicConfig(
@@ -15,4 +19,10 @@ __all__ = [
     "Tool",
     "LLMClient",
     "ChatSession",
+    "SidecarClient",
+    "SidecarServer",
+    "ToolIndex",
+    "ToolResultProcessor",
+    "AdmissionController",
+    "AdmissionRejected",
 ]
@@ -0,0 +1,211 @@
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Optional
+import asyncio
+import logging
+import time
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is not admitted; carries the HTTP status and Retry-After hint."""
+
+    def __init__(self, status_code: int, reason: str, retry_after: float) -> None:
+        super().__init__(reason)
+        self.status_code: int = status_code
+        self.reason: str = reason
+        self.retry_after: float = retry_after
+
+
+class _Waiter:
+    def __init__(self, deadline: float) -> None:
+        self.deadline: float = deadline
+        self.enqueued_at: float = time.monotonic()
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class AdmissionController:
+    """Adaptive concurrency limiter with a bounded, per-client fair wait queue.
+
+    At most `limit` requests run at once. The limit adapts AIMD-style: it grows by one
+    slot per `limit` successful requests that finish under `target_latency` while the
+    limiter is saturated, and shrinks multiplicatively when requests are slow or fail.
+
+    Requests that cannot start immediately wait in a queue with one FIFO per client,
+    served round-robin so that a single busy client cannot starve the others. A request
+    whose deadline passes while queued is never started. When the queue (or a client's
+    share of it) is full, the request is rejected immediately with 503 (or 429) and a
+    Retry-After estimate, instead of adding to everyone's latency.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        max_queue: int = 100,
+        max_queue_per_client: int = 10,
+        target_latency: float = 30.0,
+        decrease_factor: float = 0.7
+    ) -> None:
+        """
+        Args:
+            initial_limit: Starting number of concurrent requests.
+            min_limit: Lower bound for the adaptive limit.
+            max_limit: Upper bound for the adaptive limit.
+            max_queue: Maximum number of queued requests across all clients.
+            max_queue_per_client: Maximum number of queued requests per client.
+            target_latency: Request duration in seconds above which the limit is reduced.
+            decrease_factor: Multiplier applied to the limit on a slow or failed request.
+        """
+        self.limit: float = float(initial_limit)
+        self.min_limit: int = min_limit
+        self.max_limit: int = max_limit
+        self.max_queue: int = max_queue
+        self.max_queue_per_client: int = max_queue_per_client
+        self.target_latency: float = target_latency
+        self.decrease_factor: float = decrease_factor
+
+        self.inflight: int = 0
+        self._queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self._queued: int = 0
+        self._last_decrease: float = 0.0
+
+        self._latency_ewma: Optional[float] = None
+        self._wait_ewma: float = 0.0
+        self._max_wait: float = 0.0
+        self._counters: Dict[str, int] = {
+            "admitted": 0, "rejected_queue_full": 0, "rejected_client_share": 0,
+            "expired": 0, "completed": 0, "failed": 0,
+        }
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queued
+
+    def _retry_after(self) -> float:
+        """Estimate seconds until a slot frees up for a new request."""
+        latency = self._latency_ewma or self.target_latency
+        return max(1.0, latency * (self._queued + 1) / max(self.limit, 1.0))
+
+    async def acquire(self, client_id: str, deadline: float) -> None:
+        """Wait for a slot.
+
+        Args:
+            client_id: Identity used for per-client fairness.
+            deadline: time.monotonic() value after which the request must not start.
+
+        Raises:
+            AdmissionRejected: If the request is shed or its deadline passes while queued.
+        """
+        now = time.monotonic()
+        if deadline <= now:
+            self._counters["expired"] += 1
+            raise AdmissionRejected(503, "Request deadline already passed", self._retry_after())
+
+        if self.inflight < int(self.limit) and self._queued == 0:
+            self._admit(0.0)
+            return
+
+        if self._queued >= self.max_queue:
+            self._counters["rejected_queue_full"] += 1
+            raise AdmissionRejected(503, "Server is at capacity", self._retry_after())
+        queue = self._queues.setdefault(client_id, deque())
+        if len(queue) >= self.max_queue_per_client:
+            self._counters["rejected_client_share"] += 1
+            raise AdmissionRejected(429, "Too many queued requests for this client", self._retry_after())
+
+        waiter = _Waiter(deadline)
+        queue.append(waiter)
+        self._queued += 1
+
+        try:
+            await asyncio.wait({waiter.future}, timeout=deadline - now)
+        except asyncio.CancelledError:
+            self._abandon(client_id, waiter)
+            raise
+        if not waiter.future.done():
+            self._abandon(client_id, waiter)
+            self._counters["expired"] += 1
+            raise AdmissionRejected(503, "Timed out waiting for capacity", self._retry_after())
+        # raises AdmissionRejected if the dispatcher dropped the request
+        waiter.future.result()
+
+    def _abandon(self, client_id: str, waiter: _Waiter) -> None:
+        """Remove a waiter that gave up, handing back its slot if it was granted meanwhile."""
+        if waiter.future.done() and not waiter.future.cancelled() and waiter.future.exception() is None:
+            self.release(0.0, ok=True, record=False)
+            return
+        waiter.future.cancel()
+        queue = self._queues.get(client_id)
+        if queue and waiter in queue:
+            queue.remove(waiter)
+            self._queued -= 1
+            if not queue:
+                del self._queues[client_id]
+
+    def _admit(self, waited: float) -> None:
+        self.inflight += 1
+        self._counters["admitted"] += 1
+        self._wait_ewma = 0.9 * self._wait_ewma + 0.1 * waited
+        self._max_wait = max(self._max_wait, waited)
+
+    def _dispatch(self) -> None:
+        """Hand free slots to queued requests, round-robin across clients."""
+        while self.inflight < int(self.limit) and self._queued:
+            client_id, queue = next(iter(self._queues.items()))
+            waiter = queue.popleft()
+            self._queued -= 1
+            # rotate the client to the back so the next slot goes to someone else
+            if queue:
+                self._queues.move_to_end(client_id)
+            else:
+                del self._queues[client_id]
+
+            if waiter.future.done():
+                continue
+            now = time.monotonic()
+            if waiter.deadline <= now:
+                self._counters["expired"] += 1
+                waiter.future.set_exception(AdmissionRejected(
+                    503, "Request deadline passed while queued", self._retry_after()))
+                continue
+            self._admit(now - waiter.enqueued_at)
+            waiter.future.set_result(None)
+
+    def release(self, latency: float, ok: bool = True, record: bool = True) -> None:
+        """Free a slot and adapt the limit from the finished request's outcome.
+
+        Args:
+            latency: Seconds the request held its slot.
+            ok: Whether the request completed successfully.
+            record: Whether to feed this sample into the AIMD controller.
+        """
+        saturated = self.inflight >= int(self.limit)
+        self.inflight -= 1
+        if record:
+            self._counters["completed" if ok else "failed"] += 1
+            self._latency_ewma = latency if self._latency_ewma is None else \
+                0.8 * self._latency_ewma + 0.2 * latency
+            now = time.monotonic()
+            if not ok or latency > self.target_latency:
+                # decrease at most once per target_latency window so one burst of slow
+                # requests does not collapse the limit repeatedly
+                if now - self._last_decrease > self.target_latency:
+                    self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+                    self._last_decrease = now
+                    logging.info(f"Admission limit decreased to {self.limit:.1f}")
+            elif saturated:
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+        self._dispatch()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of limiter state for export."""
+        return {
+            "limit": int(self.limit),
+            "inflight": self.inflight,
+            "queue_depth": self._queued,
+            "queued_clients": len(self._queues),
+            "latency_ewma_seconds": self._latency_ewma,
+            "queue_wait_ewma_seconds": self._wait_ewma,
+            "queue_wait_max_seconds": self._max_wait,
+            **self._counters,
+        }
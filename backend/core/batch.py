@@ -0,0 +1,218 @@
+from typing import Any, Dict, List, Optional, Set
+from core.session import ChatSession
+import asyncio
+import json
+import logging
+import os
+import time
+
+
+class BatchProgress:
+    """Counters for a running or finished batch job."""
+
+    def __init__(self) -> None:
+        self.status: str = "pending"
+        self.total: int = 0
+        self.skipped: int = 0
+        self.completed: int = 0
+        self.failed: int = 0
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = ((self.finished_at or time.time()) - self.started_at) if self.started_at else 0.0
+        done = self.completed + self.failed
+        return {
+            "status": self.status,
+            "total": self.total,
+            "skipped": self.skipped,
+            "completed": self.completed,
+            "failed": self.failed,
+            "error": self.error,
+            "elapsed_seconds": elapsed,
+            "conversations_per_second": done / elapsed if elapsed else 0.0,
+        }
+
+
+class BatchRunner:
+    """Replays conversations from a JSONL file through isolated chat sessions.
+
+    Each input line is a conversation: {"id": "...", "messages": ["first turn", "second turn"],
+    "collection": optional, "filters": optional}. Conversations run concurrently in a fork of
+    the given ChatSession, so they share its MCP connections, LLM connection pool, vector
+    store and tool catalogue while keeping their history separate.
+
+    Retrieval for a window of upcoming conversations is done up front with one
+    `query_batch` call per (collection, filters) group, so the embedding model sees large
+    batches instead of one query per turn.
+
+    Results are appended to the output JSONL as each conversation finishes. The output file
+    doubles as the checkpoint: on restart, conversations already present without an error
+    are skipped and failed ones are retried. The latest record for an id wins, and once a
+    run completes the file is compacted to one record per conversation.
+    """
+
+    def __init__(self, chat_session: ChatSession, concurrency: int = 8, retrieval_batch_size: int = 256) -> None:
+        """
+        Args:
+            chat_session: An initialized session whose resources the batch shares.
+            concurrency: Number of conversations processed at once.
+            retrieval_batch_size: Maximum number of user turns embedded per query_batch call.
+        """
+        # template for the per-conversation forks; also used for batched retrieval
+        self.session = chat_session.fork()
+        self.concurrency: int = concurrency
+        self.retrieval_batch_size: int = retrieval_batch_size
+
+    @staticmethod
+    def completed_ids(output_path: str) -> Set[str]:
+        """Ids of conversations whose latest record in the output file has no error."""
+        return {conversation_id for conversation_id, record in BatchRunner._latest_records(output_path).items()
+                if "error" not in json.loads(record)}
+
+    @staticmethod
+    def _latest_records(output_path: str) -> Dict[str, str]:
+        """The last line written for each conversation id, in first-seen order."""
+        latest: Dict[str, str] = {}
+        if not os.path.exists(output_path):
+            return latest
+        with open(output_path, "r") as f:
+            for line in f:
+                try:
+                    latest[str(json.loads(line)["id"])] = line.rstrip("\n")
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    # a torn last line from an interrupted run; the conversation is redone
+                    continue
+        return latest
+
+    @staticmethod
+    def compact(output_path: str) -> None:
+        """Rewrite the output file with one record per conversation, keeping the latest.
+
+        Resumed runs append a new record for each retried conversation; this drops the
+        superseded ones. The file is replaced atomically.
+        """
+        latest = BatchRunner._latest_records(output_path)
+        tmp_path = f"{output_path}.tmp"
+        with open(tmp_path, "w") as f:
+            for record in latest.values():
+                f.write(record + "\n")
+        os.replace(tmp_path, output_path)
+
+    async def run(self, input_path: str, output_path: str, progress: Optional[BatchProgress] = None) -> BatchProgress:
+        """Process every conversation in `input_path` that is not yet in `output_path`."""
+        progress = progress or BatchProgress()
+        progress.status = "running"
+        progress.started_at = time.time()
+
+        done = await asyncio.to_thread(self.completed_ids, output_path)
+        pending = []
+        with open(input_path, "r") as f:
+            for number, line in enumerate(f):
+                if not line.strip():
+                    continue
+                conversation = json.loads(line)
+                conversation.setdefault("id", str(number))
+                progress.total += 1
+                if str(conversation["id"]) in done:
+                    progress.skipped += 1
+                else:
+                    pending.append(conversation)
+        logging.info(
+            f"Batch: {len(pending)} conversations to run, {progress.skipped} already done")
+
+        queue: asyncio.Queue = asyncio.Queue()
+        write_lock = asyncio.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+
+        with open(output_path, "a") as output:
+            async def worker() -> None:
+                while True:
+                    conversation = await queue.get()
+                    if conversation is None:
+                        return
+                    record = await self._run_conversation(conversation)
+                    async with write_lock:
+                        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+                        output.flush()
+                    if "error" in record:
+                        progress.failed += 1
+                    else:
+                        progress.completed += 1
+
+            workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+            try:
+                window = max(self.concurrency * 4, 1)
+                for start in range(0, len(pending), window):
+                    chunk = pending[start:start + window]
+                    await self._prefetch_retrieval(chunk)
+                    for conversation in chunk:
+                        await queue.put(conversation)
+                    # keep at most one window queued ahead of the workers
+                    while queue.qsize() > window:
+                        await asyncio.sleep(0.05)
+                for _ in workers:
+                    await queue.put(None)
+                await asyncio.gather(*workers)
+                progress.status = "completed"
+            except BaseException as e:
+                for task in workers:
+                    task.cancel()
+                progress.status = "failed"
+                progress.error = str(e) or type(e).__name__
+                raise
+            finally:
+                progress.finished_at = time.time()
+        await asyncio.to_thread(self.compact, output_path)
+        return progress
+
+    async def _prefetch_retrieval(self, conversations: List[Dict[str, Any]]) -> None:
+        """Retrieve context for every turn of `conversations` with batched queries.
+
+        Turns left without a prefetched result fall back to chat_once's own query.
+        """
+        store = self.session.vector_store
+        # a store still warming up answers every query empty; let each turn query later
+        if not store or not store.ready:
+            return
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for conversation in conversations:
+            key = json.dumps([conversation.get("collection"), conversation.get("filters")], sort_keys=True)
+            groups.setdefault(key, []).append(conversation)
+
+        for members in groups.values():
+            collection, filters = members[0].get("collection"), members[0].get("filters")
+            turns = [(c, i, text) for c in members for i, text in enumerate(c["messages"])]
+            for start in range(0, len(turns), self.retrieval_batch_size):
+                window = turns[start:start + self.retrieval_batch_size]
+                try:
+                    result = await asyncio.to_thread(
+                        store.query_batch, [t[2] for t in window], 5, filters, collection)
+                except Exception as e:
+                    logging.warning(f"Batched retrieval failed, falling back to per-turn queries: {e}")
+                    continue
+                for row, (conversation, turn, _) in enumerate(window):
+                    # None rather than [] so an empty row is queried again per turn
+                    conversation.setdefault("_retrieved", {})[turn] = result.documents(row) or None
+
+    async def _run_conversation(self, conversation: Dict[str, Any]) -> Dict[str, Any]:
+        conversation_id = f"batch:{conversation['id']}"
+        retrieved = conversation.pop("_retrieved", {})
+        record: Dict[str, Any] = {"id": conversation["id"], "turns": []}
+        started = time.perf_counter()
+        # a fork per conversation: its history and offloaded tool results are dropped with it
+        session = self.session.fork()
+        try:
+            for turn, user_input in enumerate(conversation["messages"]):
+                responses = []
+                async for response in session.chat_once(
+                        user_input, conversation_id, conversation.get("collection"),
+                        conversation.get("filters"), retrieved.get(turn)):
+                    responses.append(response)
+                record["turns"].append({"user": user_input, "responses": responses})
+        except Exception as e:
+            logging.warning(f"Batch conversation {conversation['id']} failed: {e}")
+            record["error"] = str(e)
+        record["elapsed_seconds"] = time.perf_counter() - started
+        return record
@@ -0,0 +1,219 @@
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Optional
+import asyncio
+import concurrent.futures.thread
+import cProfile
+import io
+import logging
+import pstats
+import queue
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+
+
+class LoopLagMonitor:
+    """Detects event loop stalls and records the stack that caused them.
+
+    A watchdog thread expects the loop to run a heartbeat callback every `interval`
+    seconds. When the heartbeat is late by more than `threshold`, the watchdog captures
+    the event loop thread's current stack, so the blocking call (a synchronous HTTP
+    request, model inference, a FAISS search) is visible while it is still running.
+    asyncio's debug-mode slow callback warnings are enabled with the same threshold.
+    """
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.1, history: int = 100,
+                 asyncio_debug: bool = False) -> None:
+        """
+        Args:
+            interval: Seconds between heartbeats scheduled on the loop.
+            threshold: Lag in seconds above which a stall is recorded.
+            history: Number of stalls kept for the admin endpoint.
+            asyncio_debug: Also enable asyncio debug mode, which logs every callback slower
+                than `threshold` at the cost of noticeable overhead.
+        """
+        self.asyncio_debug: bool = asyncio_debug
+        self.interval: float = interval
+        self.threshold: float = threshold
+        self.stalls: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self.max_lag: float = 0.0
+        self._last_beat: float = time.monotonic()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._stop = threading.Event()
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start monitoring the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._loop.slow_callback_duration = self.threshold
+        if self.asyncio_debug:
+            self._loop.set_debug(True)
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+        logging.info(f"Event loop lag monitor started (threshold {self.threshold * 1000:.0f}ms)")
+
+    async def _heartbeat(self) -> None:
+        while True:
+            self._last_beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    def _watch(self) -> None:
+        reported_beat = None
+        stall_stack: Optional[List[str]] = None
+        while not self._stop.wait(self.interval / 2):
+            beat = self._last_beat
+            lag = time.monotonic() - beat - self.interval
+            if lag > self.threshold and beat != reported_beat:
+                # first sighting of this stall: capture what the loop thread is running now
+                frame = sys._current_frames().get(self._loop_thread_id)
+                stall_stack = traceback.format_stack(frame) if frame else []
+                reported_beat = beat
+                self.stalls.append({"started": time.time() - lag, "lag_seconds": lag, "stack": stall_stack})
+                logging.warning(f"Event loop blocked for {lag * 1000:.0f}ms:\n{''.join(stall_stack[-5:])}")
+            elif lag > self.threshold and self.stalls:
+                # stall still in progress: keep its duration up to date
+                self.stalls[-1]["lag_seconds"] = lag
+            self.max_lag = max(self.max_lag, lag)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "threshold_seconds": self.threshold,
+            "max_lag_seconds": self.max_lag,
+            "stalls": list(self.stalls),
+        }
+
+
+# a thread whose innermost Python frame is in one of these is parked waiting for work
+_IDLE_WAIT_FILES = {threading.__file__, queue.__file__, concurrent.futures.thread.__file__}
+
+
+class SamplingProfiler:
+    """Statistical CPU profiler that samples every busy thread's stack at a fixed interval.
+
+    Output is in the folded-stack format ("frame;frame;frame count" per line) accepted by
+    flamegraph.pl, speedscope and most other flame graph tools. Sampling from a separate
+    thread keeps the overhead low enough to run against production traffic.
+
+    Threads parked in a threading or queue wait, such as idle executor workers, are
+    skipped so they do not dominate the profile. The event loop thread is always sampled.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval: float = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._loop_thread_id: Optional[int] = None
+        self.started_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        self.samples.clear()
+        self._stop.clear()
+        self.started_at = time.monotonic()
+        # called on the event loop thread
+        self._loop_thread_id = threading.get_ident()
+        self._thread = threading.Thread(target=self._sample, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def _sample(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if thread_id != self._loop_thread_id and frame.f_code.co_filename in _IDLE_WAIT_FILES:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self) -> str:
+        """Stop sampling and return the folded stacks."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+
+class DeterministicProfiler:
+    """cProfile wrapper for exact call counts on the event loop thread."""
+
+    def __init__(self) -> None:
+        self.profile: Optional[cProfile.Profile] = None
+
+    @property
+    def running(self) -> bool:
+        return self.profile is not None
+
+    def start(self) -> None:
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def stop(self, limit: int = 50) -> str:
+        """Stop profiling and return the top functions by cumulative time."""
+        self.profile.disable()
+        output = io.StringIO()
+        pstats.Stats(self.profile, stream=output).sort_stats("cumulative").print_stats(limit)
+        self.profile = None
+        return output.getvalue()
+
+
+# set while a tracemalloc_diff capture runs; only the event loop thread touches it
+_memory_capture_running = False
+
+
+async def tracemalloc_diff(seconds: float, limit: int = 25, frames: int = 10) -> List[Dict[str, Any]]:
+    """Compare two tracemalloc snapshots taken `seconds` apart.
+
+    Snapshots and the comparison run in a worker thread so the diagnostic does not itself
+    stall the event loop.
+
+    Returns:
+        The `limit` allocation sites with the largest growth, each with its traceback.
+
+    Raises:
+        RuntimeError: If another capture is already running.
+    """
+    global _memory_capture_running
+    if _memory_capture_running:
+        raise RuntimeError("A memory capture is already running")
+    _memory_capture_running = True
+    started_here = not tracemalloc.is_tracing()
+    if started_here:
+        tracemalloc.start(frames)
+    try:
+        before = await asyncio.to_thread(tracemalloc.take_snapshot)
+        await asyncio.sleep(seconds)
+        after = await asyncio.to_thread(tracemalloc.take_snapshot)
+    finally:
+        if started_here:
+            tracemalloc.stop()
+        _memory_capture_running = False
+
+    stats = (await asyncio.to_thread(after.compare_to, before, "traceback"))[:limit]
+    return [{
+        "size_diff_bytes": stat.size_diff,
+        "size_bytes": stat.size,
+        "count_diff": stat.count_diff,
+        "traceback": stat.traceback.format(),
+    } for stat in stats]
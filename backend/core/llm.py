@@ -1,4 +1,5 @@
 import requests
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Optional
 import logging
 import time
@@ -8,11 +9,16 @@ import re
 class LLMClient:
     """Manages communication with the LLM provider."""
 
-    def __init__(self, provider: str, api_key: str, model: str, endpoint: Optional[str]) -> None:
+    def __init__(self, provider: str, api_key: str, model: str, endpoint: Optional[str], pool_size: int = 64) -> None:
         self.provider = provider
         self.api_key = api_key
         self.model = model
         self.endpoint = endpoint
+        # one keep-alive connection pool shared by every conversation using this client
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.http.mount("https://", adapter)
+        self.http.mount("http://", adapter)
 
     def get_response(self, messages: List[Dict[str, str]]) -> str:
         """Get a response from the configured LLM provider. 
@@ -93,7 +99,7 @@ class LLMClient:
 
         for attempt in range(max_retries):
             try:
-                response = requests.post(url, headers=headers, json=payload)
+                response = self.http.post(url, headers=headers, json=payload)
                 response.raise_for_status()
                 data = response.json()
                 return data['choices'][0]['message']['content']
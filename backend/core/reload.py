@@ -0,0 +1,180 @@
+from typing import Any, Callable, Dict, List, Optional, Set
+from core.server import Server, Tool
+from core.session import ChatSession
+from helpers import load_config_with_env
+import asyncio
+import logging
+import os
+import time
+
+
+class HotReloader:
+    """Applies changes to servers_config.json and the vector corpus without a restart.
+
+    Server changes are diffed by name: new servers are started, changed ones are started
+    under their new config, and only once every new server is up and its tools are listed
+    is the tool catalogue swapped in. Removed and replaced servers are then drained (their
+    in-flight tool calls finish) and stopped. If a new server fails to start or exposes a
+    reserved tool name, the reload is abandoned and the running set is left untouched.
+
+    Corpus changes trigger a background re-index; the vector store swaps each new index in
+    atomically, so queries keep being served from the old index until then.
+    """
+
+    def __init__(
+        self,
+        chat_session: ChatSession,
+        config_path: str = "servers_config.json",
+        server_factory: Callable[[str, Dict[str, Any]], Server] = Server,
+        drain_timeout: float = 60.0,
+        reload_servers: bool = True
+    ) -> None:
+        """
+        Args:
+            chat_session: The session whose servers and vector store are reloaded.
+            config_path: Path of the MCP servers configuration file.
+            server_factory: Builds a server from its name and config.
+            drain_timeout: Maximum seconds to wait for in-flight tool calls on a server being stopped.
+            reload_servers: Whether server config changes are applied in this process.
+        """
+        self.chat_session = chat_session
+        self.config_path: str = config_path
+        self.server_factory = server_factory
+        self.drain_timeout: float = drain_timeout
+        self.reload_servers_enabled: bool = reload_servers
+        self._config_mtime: Optional[float] = self._mtime(config_path)
+        self._lock: asyncio.Lock = asyncio.Lock()
+        self._watch_task: Optional[asyncio.Task] = None
+        self._reindex_task: Optional[asyncio.Task] = None
+        self._drain_tasks: Set[asyncio.Task] = set()
+        self._stopping: bool = False
+
+    @staticmethod
+    def _mtime(path: str) -> Optional[float]:
+        return os.stat(path).st_mtime if os.path.exists(path) else None
+
+    async def reload_servers(self) -> Dict[str, List[str]]:
+        """Diff the config file against the running servers and apply the changes.
+
+        Returns:
+            The names of the servers that were added, removed and restarted.
+        """
+        async with self._lock:
+            mtime = self._mtime(self.config_path)
+            new_config = load_config_with_env(self.config_path)['mcpServers']
+            current = {server.name: server for server in self.chat_session.servers}
+
+            added = [name for name in new_config if name not in current]
+            removed = [name for name in current if name not in new_config]
+            changed = [name for name in new_config
+                       if name in current and getattr(current[name], 'config', None) != new_config[name]]
+            summary = {"added": added, "removed": removed, "restarted": changed}
+            # only now: a half-written file that fails to parse is picked up again on the next poll
+            self._config_mtime = mtime
+            if not (added or removed or changed):
+                return summary
+
+            started = [self.server_factory(name, new_config[name]) for name in added + changed]
+            try:
+                for server in started:
+                    await server.initialize()
+                new_tools = {server.name: await server.list_tools() for server in started}
+                ChatSession.check_reserved_tool_names([t for tools in new_tools.values() for t in tools])
+            except Exception as e:
+                logging.error(f"Server reload aborted, keeping the running servers: {e}")
+                await asyncio.gather(*(s.cleanup() for s in started), return_exceptions=True)
+                raise
+
+            started_by_name = {server.name: server for server in started}
+            servers: List[Server] = []
+            tools: List[Tool] = []
+            tool_servers: Dict[str, Server] = {}
+            for name in new_config:
+                server = started_by_name.get(name, current.get(name))
+                server_tools = new_tools.get(name)
+                if server_tools is None:
+                    server_tools = [t for t in self.chat_session.tools
+                                    if self.chat_session.tool_servers.get(t.name) is server]
+                servers.append(server)
+                tools.extend(server_tools)
+                for tool in server_tools:
+                    tool_servers[tool.name] = server
+
+            if self.chat_session.tool_index:
+                await asyncio.to_thread(self.chat_session.tool_index.build, tools)
+            self.chat_session.apply_servers(servers, tools, tool_servers)
+            logging.info(f"Servers reloaded: {summary}")
+
+            for name in removed + changed:
+                task = asyncio.create_task(self._drain_and_stop(current[name]))
+                self._drain_tasks.add(task)
+                task.add_done_callback(self._drain_tasks.discard)
+            return summary
+
+    async def _drain_and_stop(self, server: Server) -> None:
+        deadline = time.monotonic() + self.drain_timeout
+        active_calls = self.chat_session.active_calls
+        while active_calls[server] > 0 and time.monotonic() < deadline and not self._stopping:
+            await asyncio.sleep(0.1)
+        if active_calls[server] > 0:
+            logging.warning(f"Stopping {server.name} with {active_calls[server]} calls still running")
+        active_calls.pop(server, None)
+        await server.cleanup()
+        logging.info(f"Stopped retired server {server.name}")
+
+    def reindex(self) -> bool:
+        """Start a background re-index of changed corpora unless one is already running.
+
+        Returns:
+            Whether a re-index is running after the call.
+        """
+        store = self.chat_session.vector_store
+        if not store or not store.ready:
+            return False
+        if self._reindex_task and not self._reindex_task.done():
+            return True
+
+        async def run() -> None:
+            try:
+                reloaded = await asyncio.to_thread(store.refresh)
+                if reloaded:
+                    logging.info(f"Re-indexed collections: {reloaded}")
+            except Exception as e:
+                logging.error(f"Corpus re-index failed, still serving the previous index: {e}")
+
+        self._reindex_task = asyncio.create_task(run())
+        return True
+
+    async def check(self) -> None:
+        """Apply any change to the config file and re-index changed corpora."""
+        if self.reload_servers_enabled and self._mtime(self.config_path) != self._config_mtime:
+            try:
+                await self.reload_servers()
+            except Exception as e:
+                logging.error(f"Reloading {self.config_path} failed: {e}")
+        self.reindex()
+
+    def start(self, interval: float) -> None:
+        """Poll for changes every `interval` seconds."""
+        async def watch() -> None:
+            while True:
+                await asyncio.sleep(interval)
+                await self.check()
+
+        self._watch_task = asyncio.create_task(watch())
+        logging.info(f"Watching {self.config_path} and the vector corpus every {interval}s")
+
+    async def stop(self) -> None:
+        """Stop watching and stop every retired server that is still draining.
+
+        On shutdown the in-flight calls are not waited for: each draining server is stopped
+        right away, and this returns once they all are.
+        """
+        self._stopping = True
+        if self._watch_task:
+            self._watch_task.cancel()
+            await asyncio.gather(self._watch_task, return_exceptions=True)
+            self._watch_task = None
+        # let a reload in progress finish, so it cannot schedule a drain after this
+        async with self._lock:
+            await asyncio.gather(*self._drain_tasks, return_exceptions=True)
@@ -1,25 +1,320 @@
-from typing import Any, Dict, List, Optional
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 import asyncio
+import json
 import os
 import shutil
 import logging
 
+REMOTE_TRANSPORTS = ("sse", "streamable_http")
+
+
+@lru_cache(maxsize=None)
+def _transport_errors() -> Tuple[type, ...]:
+    """Exception types that mean the connection is broken, as opposed to a protocol-level error."""
+    import anyio
+    import httpx
+    return (ConnectionError, OSError, EOFError, asyncio.TimeoutError, httpx.TransportError,
+            anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream)
+
+
+def is_transport_error(error: BaseException) -> bool:
+    """Whether `error` calls for a reconnect. Errors returned by the server (unknown tool,
+    invalid params) leave the session usable and must not tear it down. A closed session
+    and a call that timed out waiting for its response both count as transport errors."""
+    if isinstance(error, _transport_errors()):
+        return True
+    from mcp.shared.exceptions import McpError
+    from mcp.types import CONNECTION_CLOSED
+    import httpx
+    return isinstance(error, McpError) and error.error.code in (
+        CONNECTION_CLOSED, httpx.codes.REQUEST_TIMEOUT)
+
+
+@asynccontextmanager
+async def _streamable_http_client(url: str, headers: Dict[str, str]):
+    # newer mcp releases renamed the client and take a configured httpx client instead of headers
+    from mcp.client import streamable_http
+    if not hasattr(streamable_http, "streamable_http_client"):
+        async with streamable_http.streamablehttp_client(url, headers=headers) as streams:
+            yield streams
+        return
+    import httpx
+    # the same timeouts the old client applied: long reads for streamed responses
+    timeout = httpx.Timeout(30.0, read=300.0)
+    async with httpx.AsyncClient(headers=headers, timeout=timeout) as http_client:
+        async with streamable_http.streamable_http_client(url, http_client=http_client) as streams:
+            yield streams
+
+
+class RemoteConnection:
+    """A long-lived, shared MCP client session to a remote (SSE or streamable HTTP) server.
+
+    The transport and session context managers are entered and exited inside one dedicated
+    task, as anyio requires, so the connection can be torn down and re-established from
+    any caller. A keep-alive task pings the server and reconnects with exponential backoff
+    when the ping fails. Concurrent tool calls are multiplexed over the single session,
+    bounded by `max_concurrent_calls`.
+
+    `generation` increases with every successful connect. Callers pass the generation they
+    saw fail to `reconnect`, so when many in-flight calls fail together only the first one
+    reconnects and the others pick up the fresh session instead of replacing it again.
+    Calls still waiting on a session when its connection task exits fail with a
+    ConnectionError rather than waiting for a response that can no longer arrive.
+    """
+
+    def __init__(self, transport: str, url: str, headers: Optional[Dict[str, str]] = None,
+                 keepalive_interval: float = 30.0, max_concurrent_calls: int = 16,
+                 max_reconnect_attempts: int = 5, reconnect_base_delay: float = 0.5) -> None:
+        self.transport: str = transport
+        self.url: str = url
+        self.headers: Dict[str, str] = headers or {}
+        self.keepalive_interval: float = keepalive_interval
+        self.max_reconnect_attempts: int = max_reconnect_attempts
+        self.reconnect_base_delay: float = reconnect_base_delay
+        self.session: Optional[ClientSession] = None
+        self.capabilities: Optional[Any] = None
+        self.call_slots: asyncio.Semaphore = asyncio.Semaphore(max_concurrent_calls)
+        self.refcount: int = 0
+        self.generation: int = 0
+        self.connecting: Optional[asyncio.Task] = None
+        self._closed: asyncio.Event = asyncio.Event()
+        self._connection_task: Optional[asyncio.Task] = None
+        self._keepalive_task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._reconnect_lock: asyncio.Lock = asyncio.Lock()
+
+    def _transport_context(self):
+        # remote transports are imported on first use, so stdio-only deployments never load them
+        if self.transport == "sse":
+            from mcp.client.sse import sse_client
+            return sse_client(self.url, headers=self.headers)
+        return _streamable_http_client(self.url, self.headers)
+
+    async def _run(self, connected: asyncio.Future, stop: asyncio.Event,
+                   closed: asyncio.Event) -> None:
+        try:
+            async with self._transport_context() as streams:
+                # sse yields (read, write); streamable HTTP also yields a session id getter
+                read, write = streams[0], streams[1]
+                async with ClientSession(read, write) as session:
+                    capabilities = await session.initialize()
+                    self.session = session
+                    self.capabilities = capabilities
+                    self.generation += 1
+                    connected.set_result(None)
+                    await stop.wait()
+        except Exception as e:
+            if not connected.done():
+                connected.set_exception(e)
+            else:
+                logging.warning(f"Remote MCP connection to {self.url} dropped: {e}")
+        finally:
+            self.session = None
+            # wake every call still waiting on this session
+            closed.set()
+
+    async def connect(self) -> None:
+        """Open the connection and start the keep-alive task."""
+        self._stop = asyncio.Event()
+        self._closed = asyncio.Event()
+        connected = asyncio.get_running_loop().create_future()
+        self._connection_task = asyncio.create_task(
+            self._run(connected, self._stop, self._closed))
+        await connected
+        if self._keepalive_task is None and self.keepalive_interval > 0:
+            self._keepalive_task = asyncio.create_task(self._keepalive())
+        logging.info(f"Connected to remote MCP server at {self.url} over {self.transport}")
+
+    async def _disconnect(self) -> None:
+        if self._stop:
+            self._stop.set()
+        if self._connection_task:
+            if self.session is None:
+                # still connecting, so the task is not waiting on the stop event
+                self._connection_task.cancel()
+            await asyncio.gather(self._connection_task, return_exceptions=True)
+            self._connection_task = None
+
+    async def reconnect(self, failed_generation: Optional[int] = None) -> None:
+        """Re-establish the connection, retrying with exponential backoff.
+
+        Args:
+            failed_generation: Generation of the session the caller saw fail. If the
+                connection has been re-established since, nothing is done.
+
+        Raises:
+            Exception: The last connection error once all attempts have failed.
+        """
+        async with self._reconnect_lock:
+            if (failed_generation is not None and failed_generation != self.generation
+                    and self.session is not None):
+                return
+            await self._disconnect()
+            for attempt in range(self.max_reconnect_attempts):
+                try:
+                    await self.connect()
+                    return
+                except Exception as e:
+                    delay = self.reconnect_base_delay * (2 ** attempt)
+                    logging.warning(
+                        f"Reconnect to {self.url} failed ({e}); attempt {attempt + 1} of "
+                        f"{self.max_reconnect_attempts}, retrying in {delay:.1f}s")
+                    if attempt + 1 == self.max_reconnect_attempts:
+                        raise
+                    await asyncio.sleep(delay)
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any], timeout: float) -> Any:
+        """Call a tool on the current session.
+
+        Raises:
+            ConnectionError: If there is no session, or its connection closes before the
+                response arrives.
+            McpError: If the server reports an error, or no response arrives within
+                `timeout` seconds.
+        """
+        session, closed = self.session, self._closed
+        if session is None:
+            raise ConnectionError(f"Not connected to {self.url}")
+        call = asyncio.ensure_future(session.call_tool(
+            name, arguments, read_timeout_seconds=timedelta(seconds=timeout)))
+        lost = asyncio.ensure_future(closed.wait())
+        try:
+            done, _ = await asyncio.wait((call, lost), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            lost.cancel()
+            call.cancel()
+        if call not in done:
+            raise ConnectionError(f"Connection to {self.url} closed during {name}")
+        return call.result()
+
+    async def _keepalive(self) -> None:
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            generation = self.generation
+            try:
+                if self.session is None:
+                    raise ConnectionError("session closed")
+                await asyncio.wait_for(self.session.send_ping(), timeout=self.keepalive_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.warning(f"Keep-alive to {self.url} failed: {e}; reconnecting")
+                try:
+                    await self.reconnect(generation)
+                except Exception as e:
+                    logging.error(f"Could not reconnect to {self.url}: {e}")
+
+    async def close(self) -> None:
+        """Stop the keep-alive task and close the connection."""
+        if self._keepalive_task:
+            self._keepalive_task.cancel()
+            await asyncio.gather(self._keepalive_task, return_exceptions=True)
+            self._keepalive_task = None
+        await self._disconnect()
+
+
+# connections shared by every Server in the process that targets the same remote endpoint
+_remote_pool: Dict[Tuple[str, str, str], RemoteConnection] = {}
+_remote_pool_lock = asyncio.Lock()
+
+
+def _unpool(connection: RemoteConnection) -> None:
+    for key, pooled in list(_remote_pool.items()):
+        if pooled is connection:
+            del _remote_pool[key]
+
+
+async def acquire_remote_connection(config: Dict[str, Any]) -> RemoteConnection:
+    """Return the pooled connection for a remote server config, connecting it if needed.
+
+    The connect itself runs outside the pool lock, so an unreachable endpoint does not
+    hold up servers that use other endpoints. Callers that want the same endpoint while
+    it is connecting wait on the one `connecting` task.
+    """
+    headers = config.get('headers', {})
+    key = (config['transport'], config['url'], json.dumps(headers, sort_keys=True))
+    async with _remote_pool_lock:
+        connection = _remote_pool.get(key)
+        if connection is None:
+            connection = RemoteConnection(
+                config['transport'], config['url'], headers,
+                keepalive_interval=config.get('keepalive_interval', 30.0),
+                max_concurrent_calls=config.get('max_concurrent_calls', 16),
+                max_reconnect_attempts=config.get('max_reconnect_attempts', 5))
+            connection.connecting = asyncio.ensure_future(connection.connect())
+            _remote_pool[key] = connection
+        connection.refcount += 1
+    try:
+        await asyncio.shield(connection.connecting)
+    except BaseException:
+        await release_remote_connection(connection)
+        raise
+    return connection
+
+
+async def release_remote_connection(connection: RemoteConnection) -> None:
+    """Drop one reference to a pooled connection, closing it when unused."""
+    connecting = connection.connecting
+    async with _remote_pool_lock:
+        connection.refcount -= 1
+        failed = connecting.done() and (connecting.cancelled() or connecting.exception())
+        if failed:
+            # later callers get a fresh connection instead of this failed one
+            _unpool(connection)
+        if connection.refcount > 0:
+            return
+        _unpool(connection)
+    if not connecting.done():
+        connecting.cancel()
+    await asyncio.gather(connecting, return_exceptions=True)
+    await connection.close()
+
 
 class Server:
-    """Manages MCP server connections and tool execution."""
+    """Manages MCP server connections and tool execution.
+
+    A stdio server's transport and session are entered and exited inside one dedicated
+    task, like RemoteConnection, because anyio cancel scopes must be exited by the task
+    that entered them. Initialize and cleanup can therefore run in different tasks, ex. a
+    server started at boot and stopped by a hot reload.
+    """
 
     def __init__(self, name: str, config: Dict[str, Any]) -> None:
         self.name: str = name
         self.config: Dict[str, Any] = config
-        self.stdio_context: Optional[Any] = None
+        self._stdio_task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
         self.session: Optional[ClientSession] = None
         self._cleanup_lock: asyncio.Lock = asyncio.Lock()
         self.capabilities: Optional[Dict[str, Any]] = None
+        self.remote: Optional[RemoteConnection] = None
+
+    @property
+    def is_remote(self) -> bool:
+        return self.config.get('transport', 'stdio') in REMOTE_TRANSPORTS
 
     async def initialize(self) -> None:
-        """Initialize the server connection."""
+        """Initialize the server connection.
+
+        Servers with "transport": "sse" or "streamable_http" and a "url" in their config
+        attach to a pooled remote connection; all others are spawned over stdio.
+        """
+        if self.is_remote:
+            try:
+                self.remote = await acquire_remote_connection(self.config)
+                self.session = self.remote.session
+                self.capabilities = self.remote.capabilities
+            except Exception as e:
+                logging.error(f"Error initializing server {self.name}: {e}")
+                await self.cleanup()
+                raise
+            return
+
         server_params = StdioServerParameters(
             command=shutil.which(
                 "npx") if self.config['command'] == "npx" else self.config['command'],
@@ -27,17 +322,35 @@ class Server:
             env={**os.environ, **self.config['env']
                  } if self.config.get('env') else None
         )
+        self._stop = asyncio.Event()
+        ready = asyncio.get_running_loop().create_future()
+        self._stdio_task = asyncio.create_task(self._run_stdio(server_params, ready, self._stop))
         try:
-            self.stdio_context = stdio_client(server_params)
-            read, write = await self.stdio_context.__aenter__()
-            self.session = ClientSession(read, write)
-            await self.session.__aenter__()
-            self.capabilities = await self.session.initialize()
-        except Exception as e:
+            await ready
+        except BaseException as e:
             logging.error(f"Error initializing server {self.name}: {e}")
             await self.cleanup()
             raise
 
+    async def _run_stdio(self, server_params: StdioServerParameters, ready: asyncio.Future,
+                         stop: asyncio.Event) -> None:
+        try:
+            async with stdio_client(server_params) as (read, write):
+                async with ClientSession(read, write) as session:
+                    self.capabilities = await session.initialize()
+                    self.session = session
+                    ready.set_result(None)
+                    await stop.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logging.warning(f"Server {self.name} stopped: {e}")
+        finally:
+            self.session = None
+            if not ready.done():
+                ready.set_exception(RuntimeError(f"Server {self.name} exited during startup"))
+
     async def list_tools(self) -> List[Any]:
         """List available tools from the server.
 
@@ -50,6 +363,8 @@ class Server:
         if not self.session:
             raise RuntimeError(f"Server {self.name} not initialized")
 
+        if self.remote:
+            self.session = self.remote.session or self.session
         tools_response = await self.session.list_tools()
         tools = []
 
@@ -97,6 +412,9 @@ class Server:
         if not self.session:
             raise RuntimeError(f"Server {self.name} not initialized")
 
+        if self.remote:
+            return await self._execute_remote_tool(tool_name, arguments, retries, delay)
+
         attempt = 0
         while attempt < retries:
             try:
@@ -130,33 +448,63 @@ class Server:
                     logging.error("Max retries reached. Failing.")
                     raise
 
+    async def _execute_remote_tool(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        retries: int,
+        delay: float
+    ) -> Any:
+        """Execute a tool over the pooled remote connection.
+
+        The session is shared with every other call to the same endpoint, so only transport
+        failures reconnect and retry. A call with no response after the server's
+        "call_timeout" seconds (default 60) counts as one. Errors reported by the server are
+        raised as they are.
+        """
+        timeout = self.config.get('call_timeout', 60.0)
+        attempt = 0
+        while True:
+            # pick up the current session in case the pool reconnected
+            generation = self.remote.generation
+            try:
+                async with self.remote.call_slots:
+                    logging.info(f"Executing {tool_name} remotely...")
+                    return await self.remote.call_tool(tool_name, arguments, timeout)
+            except Exception as e:
+                attempt += 1
+                if not is_transport_error(e):
+                    raise
+                logging.warning(
+                    f"Connection error executing tool: {e}. Attempt {attempt} of {retries}.")
+                if attempt >= retries:
+                    logging.error("Max retries reached. Failing.")
+                    raise
+                try:
+                    await self.remote.reconnect(generation)
+                except Exception as reconnect_error:
+                    logging.warning(
+                        f"Reconnect for {self.name} failed: {reconnect_error}")
+                    await asyncio.sleep(delay)
+
     async def cleanup(self) -> None:
         """Clean up server resources."""
         async with self._cleanup_lock:
-            try:
-                if self.session:
-                    try:
-                        await self.session.__aexit__(None, None, None)
-                    except Exception as e:
-                        logging.warning(
-                            f"Warning during session cleanup for {self.name}: {e}")
-                    finally:
-                        self.session = None
-
-                if self.stdio_context:
-                    try:
-                        await self.stdio_context.__aexit__(None, None, None)
-                    except (RuntimeError, asyncio.CancelledError) as e:
-                        logging.info(
-                            f"Note: Normal shutdown message for {self.name}: {e}")
-                    except Exception as e:
-                        logging.warning(
-                            f"Warning during stdio cleanup for {self.name}: {e}")
-                    finally:
-                        self.stdio_context = None
-            except Exception as e:
-                logging.error(
-                    f"Error during cleanup of server {self.name}: {e}")
+            if self.remote:
+                # the pooled connection is closed once its last user releases it
+                remote, self.remote, self.session = self.remote, None, None
+                await release_remote_connection(remote)
+                return
+            if not self._stdio_task:
+                return
+            # the owning task exits the session and transport, terminating the child process
+            task, self._stdio_task = self._stdio_task, None
+            self._stop.set()
+            results = await asyncio.gather(task, return_exceptions=True)
+            if isinstance(results[0], BaseException):
+                logging.info(
+                    f"Note: Normal shutdown message for {self.name}: {results[0]}")
+            self.session = None
 
 
 class Tool:
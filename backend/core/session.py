@@ -1,8 +1,14 @@
 import json
-from typing import List, Dict, Optional
+from collections import Counter
+from typing import Any, List, Dict, Optional
 from core.llm import LLMClient
-from core.server import Server
+from core.server import Server, Tool
+from core.tool_index import ToolIndex
+from core.tool_results import READ_RESULT_TOOL, TRUNCATION_NOTE, ToolResultProcessor
+from helpers import estimate_tokens
 from vector_stores.base import VectorStore
+from conversation_stores.base import ConversationStore
+from conversation_stores.memory import InMemoryConversationStore
 import asyncio
 import logging
 
@@ -12,15 +18,78 @@ class ChatSession:
     Orchestrates the interaction between user, LLM, and tools.
     """
 
-    def __init__(self, servers: List[Server], llm_client: LLMClient, vector_store: Optional[VectorStore] = None) -> None:
+    DEFAULT_CONVERSATION_ID = "default"
+
+    def __init__(
+        self,
+        servers: List[Server],
+        llm_client: LLMClient,
+        vector_store: Optional[VectorStore] = None,
+        conversation_store: Optional[ConversationStore] = None,
+        tool_index: Optional[ToolIndex] = None,
+        result_processor: Optional[ToolResultProcessor] = None
+    ) -> None:
         self.servers = servers
         self.llm_client = llm_client
         self.vector_store = vector_store
-        self.messages: List[Dict[str, str]] = []
+        # conversation history is kept outside the session so any worker can serve any turn
+        self.conversation_store = conversation_store or InMemoryConversationStore()
+        # optional per-turn tool selection; the full catalogue is exposed when None
+        self.tool_index = tool_index
+        # compacts tool results and offloads oversized ones before they enter the history
+        self.result_processor = result_processor or ToolResultProcessor(
+            self.conversation_store)
+        self.tools: List[Tool] = []
+        # tool name -> server that provides it, shared with forked sessions
+        self.tool_servers: Dict[str, Server] = {}
+        # in-flight tool calls per server, so a reload can drain a server before stopping it
+        self.active_calls: Counter = Counter()
         self.system_message: str = ""
 
+    def fork(self, conversation_store: Optional[ConversationStore] = None) -> "ChatSession":
+        """Create an isolated session that shares this session's servers and clients.
+
+        The fork reuses the MCP connections, LLM connection pool, vector store, tool index
+        and tool catalogue, but keeps its conversations in its own store (in-memory by
+        default), so batch jobs do not touch interactive conversation state.
+        """
+        store = conversation_store or InMemoryConversationStore()
+        session = ChatSession(self.servers, self.llm_client, self.vector_store, store,
+                              self.tool_index, self.result_processor.with_store(store))
+        session.servers = self.servers
+        session.tools = self.tools
+        session.tool_servers = self.tool_servers
+        session.active_calls = self.active_calls
+        session.system_message = self.system_message
+        return session
+
+    def apply_servers(self, servers: List[Server], tools: List[Tool], tool_servers: Dict[str, Server]) -> None:
+        """Swap in a new server set and tool catalogue.
+
+        Runs without awaiting, so no turn on the event loop observes a partial update. The
+        containers are updated in place so that forked sessions route tool calls to the new
+        servers too; forks keep the system prompt they were created with.
+        """
+        self.servers[:] = servers
+        self.tools[:] = tools
+        self.tool_servers.clear()
+        self.tool_servers.update(tool_servers)
+        self.system_message = self._build_system_message(tools)
+
+    @staticmethod
+    def check_reserved_tool_names(tools: List[Tool]) -> None:
+        """Raise a RuntimeError if an MCP server exposes a tool under a built-in tool's name."""
+        for tool in tools:
+            if tool.name == READ_RESULT_TOOL.name:
+                raise RuntimeError(
+                    f"MCP tool name {tool.name} is reserved for the built-in result reader; rename the tool")
+
     async def initialize(self) -> None:
-        """Initialize all servers and generate the system prompt with tools."""
+        """Initialize all servers and generate the system prompt with tools.
+
+        Raises:
+            RuntimeError: If a server exposes a tool under a reserved name.
+        """
         for server in self.servers:
             try:
                 await server.initialize()
@@ -33,11 +102,25 @@ class ChatSession:
         for server in self.servers:
             tools = await server.list_tools()
             all_tools.extend(tools)
+            for tool in tools:
+                self.tool_servers[tool.name] = server
+
+        try:
+            self.check_reserved_tool_names(all_tools)
+        except RuntimeError:
+            await self.cleanup_servers()
+            raise
 
+        self.tools = all_tools
+        self.system_message = self._build_system_message(all_tools)
+
+    @staticmethod
+    def _build_system_message(tools: List[Tool]) -> str:
+        """Build the system prompt describing the given tools."""
         tools_description = "\n".join(
-            [tool.format_for_llm() for tool in all_tools])
+            [tool.format_for_llm() for tool in tools])
 
-        self.system_message = f"""You are a helpful assistant with access to these tools:
+        return f"""You are a helpful assistant with access to these tools:
 
 {tools_description}
 
@@ -70,27 +153,115 @@ IMPORTANT: Never return tool call JSON to the user. Only use tool call JSON when
 
 Please use only the tools that are explicitly defined above."""
 
-        self.messages = [{"role": "system", "content": self.system_message}]
-
-    async def chat_once(self, user_input: str):
+    async def warm_up(self) -> None:
+        """Run heavy initialization (vector store, tool embeddings) in a worker thread, off the event loop."""
         if self.vector_store:
             try:
-                docs = self.vector_store.query(user_input)
+                await asyncio.to_thread(self.vector_store.warm_up)
+            except Exception as e:
+                logging.error(f"Vector store warm-up failed: {e}")
+        if self.tool_index:
+            try:
+                await asyncio.to_thread(self.tool_index.build, self.tools)
+            except Exception as e:
+                logging.error(f"Tool index build failed: {e}")
+
+    def readiness(self) -> Dict[str, bool]:
+        """Report which components are ready to serve requests."""
+        return {
+            "servers": bool(self.system_message),
+            "vector_store": self.vector_store.ready if self.vector_store else True,
+            "tool_index": self.tool_index.ready if self.tool_index else True,
+        }
+
+    def _full_system_message(self, read_results: bool) -> str:
+        if not read_results:
+            return self.system_message
+        return self._build_system_message(self.tools + [READ_RESULT_TOOL])
+
+    async def _system_message_for(self, user_input: str, read_results: bool = False) -> str:
+        """Return the system prompt for this turn, limited to the relevant tools when a tool index is set.
+
+        READ_RESULT_TOOL is only described when `read_results` is set, i.e. once the
+        conversation has an offloaded result to read.
+        """
+        if not self.tool_index:
+            return self._full_system_message(read_results)
+        try:
+            # embedding the query is model inference; keep it off the event loop
+            selected = await asyncio.to_thread(self.tool_index.select, user_input, self.tools)
+        except Exception as e:
+            logging.warning(f"Tool selection failed, using all tools: {e}")
+            return self._full_system_message(read_results)
+        # the index may still describe tools from before a reload
+        selected = [t for t in selected if t.name in self.tool_servers]
+        if not selected or len(selected) == len(self.tools):
+            return self._full_system_message(read_results)
+
+        system_message = self._build_system_message(
+            selected + ([READ_RESULT_TOOL] if read_results else []))
+        logging.info(
+            "Exposing %d of %d tools (%s), saving ~%d prompt tokens",
+            len(selected), len(self.tools), ", ".join(t.name for t in selected),
+            estimate_tokens(self.system_message) - estimate_tokens(system_message))
+        return system_message
+
+    async def _load_messages(self, conversation_id: str, user_input: str) -> List[Dict[str, str]]:
+        """Build the full message list for a conversation: system prompt followed by stored history."""
+        # store backends (SQLite, Redis) block; keep them off the event loop
+        history = await asyncio.to_thread(self.conversation_store.load, conversation_id)
+        system_message = await self._system_message_for(
+            user_input, ToolResultProcessor.has_offloaded(history))
+        return [{"role": "system", "content": system_message}] + history
+
+    async def _append_message(self, conversation_id: str, messages: List[Dict[str, str]], message: Dict[str, str]) -> None:
+        """Append a message to the working history and persist it to the conversation store."""
+        messages.append(message)
+        await asyncio.to_thread(self.conversation_store.append, conversation_id, [message])
+
+    async def chat_once(
+        self,
+        user_input: str,
+        conversation_id: str = DEFAULT_CONVERSATION_ID,
+        collection: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        retrieved: Optional[List[Dict[str, Any]]] = None
+    ):
+        """Run one user turn, yielding each assistant response as it is produced.
+
+        Blocking work (retrieval, LLM HTTP calls) runs in worker threads so that many
+        conversations can progress concurrently on one event loop.
+
+        Args:
+            user_input: The user's message.
+            conversation_id: Conversation to continue.
+            collection: Vector store collection to retrieve from.
+            filters: Metadata filters for retrieval.
+            retrieved: Documents already retrieved for this message (ex. by a batched
+                query); the vector store is not queried again when given.
+        """
+        messages = await self._load_messages(conversation_id, user_input)
+        read_results = ToolResultProcessor.has_offloaded(messages)
+
+        if self.vector_store or retrieved is not None:
+            try:
+                docs = retrieved if retrieved is not None else await asyncio.to_thread(
+                    self.vector_store.query, user_input, filters=filters, collection=collection)
                 if docs:
                     context = "\n\n".join(doc.get("text", "") for doc in docs)
-                    self.messages.append({
+                    await self._append_message(conversation_id, messages, {
                         "role": "system",
                         "content": f"The following context may help you answer the user's question:\n{context}"
                     })
             except Exception as e:
                 logging.warning(f"Vector store query failed: {e}")
 
-        self.messages.append({"role": "user", "content": user_input})
+        await self._append_message(conversation_id, messages, {"role": "user", "content": user_input})
         logging.info("Getting LLM response...")
-        first_response = self.llm_client.get_response(self.messages)
+        first_response = await asyncio.to_thread(self.llm_client.get_response, messages)
         logging.info("Raw LLM response: %s", first_response)
 
-        self.messages.append({"role": "assistant", "content": first_response})
+        await self._append_message(conversation_id, messages, {"role": "assistant", "content": first_response})
         yield first_response
 
         while True:
@@ -104,8 +275,8 @@ Please use only the tools that are explicitly defined above."""
                 )
             }
 
-            follow_up_messages = self.messages + [follow_up_prompt]
-            tool_call_raw = self.llm_client.get_response(follow_up_messages)
+            follow_up_messages = messages + [follow_up_prompt]
+            tool_call_raw = await asyncio.to_thread(self.llm_client.get_response, follow_up_messages)
             logging.info("Tool call response: %s", tool_call_raw)
 
             try:
@@ -119,34 +290,59 @@ Please use only the tools that are explicitly defined above."""
                 logging.info(
                     f"Calling tool {tool_name} with arguments {tool_args}")
 
-                for server in self.servers:
-                    tools = await server.list_tools()
-                    if any(t.name == tool_name for t in tools):
-                        try:
-                            result = await server.execute_tool(tool_name, tool_args)
-                            self.messages.append({
-                                "role": "system",
-                                "content": f"Tool execution result: {result}"
-                            })
-
-                            assistant_response = self.llm_client.get_response(
-                                self.messages)
-                            self.messages.append({
-                                "role": "assistant",
-                                "content": assistant_response
-                            })
-
-                            yield assistant_response
-                            break
-                        except Exception as e:
-                            error_message = f"Error calling tool {tool_name}: {str(e)}"
-                            logging.warning(error_message)
-                            self.messages.append(
-                                {"role": "system", "content": error_message})
+                if tool_name == READ_RESULT_TOOL.name:
+                    try:
+                        page = await asyncio.to_thread(
+                            self.result_processor.read_page, conversation_id,
+                            tool_args.get("blob_id"), int(tool_args.get("page", 1)))
+                    except (ValueError, TypeError) as e:
+                        page = f"Error calling tool {tool_name}: {str(e)}"
+                    yield await self._respond_to_tool_result(conversation_id, messages, page)
+                    continue
+
+                server = self.tool_servers.get(tool_name)
+                if server is None:
+                    logging.warning(f"No server found with tool: {tool_name}")
+                    await self._append_message(conversation_id, messages, {
+                        "role": "system", "content": f"No server found with tool: {tool_name}"})
+                    break
+                try:
+                    self.active_calls[server] += 1
+                    try:
+                        result = await server.execute_tool(tool_name, tool_args)
+                    finally:
+                        self.active_calls[server] -= 1
+                    result_text = await asyncio.to_thread(
+                        self.result_processor.process, conversation_id, tool_name, result)
+                    if not read_results and TRUNCATION_NOTE in result_text:
+                        # the first offloaded result: describe the reader tool from now on
+                        read_results = True
+                        messages[0] = {"role": "system",
+                                       "content": await self._system_message_for(user_input, True)}
+                    yield await self._respond_to_tool_result(conversation_id, messages, result_text)
+                except Exception as e:
+                    error_message = f"Error calling tool {tool_name}: {str(e)}"
+                    logging.warning(error_message)
+                    await self._append_message(
+                        conversation_id, messages, {"role": "system", "content": error_message})
             except json.JSONDecodeError:
                 logging.warning("Tool call response was not valid JSON.")
                 break
 
+    async def _respond_to_tool_result(self, conversation_id: str, messages: List[Dict[str, str]], result_text: str) -> str:
+        """Add a processed tool result to the history and get the assistant's reply to it."""
+        await self._append_message(conversation_id, messages, {
+            "role": "system",
+            "content": f"Tool execution result: {result_text}"
+        })
+
+        assistant_response = await asyncio.to_thread(self.llm_client.get_response, messages)
+        await self._append_message(conversation_id, messages, {
+            "role": "assistant",
+            "content": assistant_response
+        })
+        return assistant_response
+
     async def process_llm_response(self, llm_response: str) -> str:
         try:
             logging.info("LLM response (pre-parse): %s", llm_response)
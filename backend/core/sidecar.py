@@ -0,0 +1,132 @@
+from typing import Any, Dict, List, Optional
+from mcp.types import CallToolResult
+from core.server import Tool
+import asyncio
+import itertools
+import json
+import logging
+
+
+class SidecarClient:
+    """Multiplexes requests from one worker to the host-local MCP sidecar over a Unix socket.
+
+    The sidecar (see mcp_sidecar.py) owns the MCP server subprocesses, so they are spawned
+    once per host instead of once per uvicorn worker. Requests and responses are
+    newline-delimited JSON objects correlated by id, which lets concurrent tool calls share
+    a single connection.
+    """
+
+    def __init__(self, socket_path: str) -> None:
+        self.socket_path: str = socket_path
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._connect_lock: asyncio.Lock = asyncio.Lock()
+        self._write_lock: asyncio.Lock = asyncio.Lock()
+
+    async def connect(self) -> None:
+        """Open the socket connection if it is not already open."""
+        async with self._connect_lock:
+            if self._writer and not self._writer.is_closing():
+                return
+            self._reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+            self._reader_task = asyncio.create_task(self._read_loop())
+            logging.info(f"Connected to MCP sidecar at {self.socket_path}")
+
+    async def _read_loop(self) -> None:
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.pop(response.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if "error" in response:
+                    future.set_exception(RuntimeError(response["error"]))
+                else:
+                    future.set_result(response.get("result"))
+        except Exception as e:
+            logging.warning(f"MCP sidecar connection lost: {e}")
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("MCP sidecar connection closed"))
+            self._pending.clear()
+
+    async def request(self, method: str, params: Dict[str, Any]) -> Any:
+        """Send a request to the sidecar and wait for its response.
+
+        Raises:
+            RuntimeError: If the sidecar reports an error.
+            ConnectionError: If the connection closes before a response arrives.
+        """
+        await self.connect()
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        payload = json.dumps({"id": request_id, "method": method, "params": params})
+        async with self._write_lock:
+            self._writer.write(payload.encode() + b"\n")
+            await self._writer.drain()
+        return await future
+
+    async def close(self) -> None:
+        """Close the socket connection."""
+        if self._writer:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except Exception as e:
+                logging.info(f"Note: MCP sidecar connection closed with: {e}")
+            self._writer = None
+        if self._reader_task:
+            self._reader_task.cancel()
+            self._reader_task = None
+
+
+class SidecarServer:
+    """Proxy for an MCP server hosted by the sidecar, exposing the same interface as Server."""
+
+    def __init__(self, name: str, client: SidecarClient) -> None:
+        self.name: str = name
+        self.client: SidecarClient = client
+        self._tools: Optional[List[Tool]] = None
+
+    async def initialize(self) -> None:
+        """Connect to the sidecar; the server process itself is already running there."""
+        try:
+            await self.client.connect()
+        except Exception as e:
+            logging.error(f"Error connecting to sidecar for server {self.name}: {e}")
+            raise
+
+    async def list_tools(self) -> List[Tool]:
+        """List tools of the proxied server. The catalogue is cached after the first call."""
+        if self._tools is None:
+            tools = await self.client.request("list_tools", {"server": self.name})
+            self._tools = [Tool(t["name"], t["description"], t["inputSchema"]) for t in tools]
+        return self._tools
+
+    async def execute_tool(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        retries: int = 2,
+        delay: float = 1.0
+    ) -> Any:
+        """Execute a tool through the sidecar, which applies its own retry policy.
+
+        Returns:
+            Tool execution result.
+        """
+        result = await self.client.request(
+            "call_tool", {"server": self.name, "tool": tool_name, "arguments": arguments})
+        return CallToolResult.model_validate(result)
+
+    async def cleanup(self) -> None:
+        """Release the sidecar connection. The shared server process keeps running."""
+        await self.client.close()
@@ -0,0 +1,87 @@
+from typing import Dict, List, Optional
+from core.server import Tool
+import logging
+import threading
+import numpy as np
+
+
+class ToolIndex:
+    """Selects the tools relevant to a user message by embedding similarity.
+
+    Each tool's name, description and argument schema are embedded once when the catalogue
+    is registered. Per turn, only the top-k closest tools are exposed to the model, which
+    keeps the system prompt small as more MCP servers are added. The full catalogue is used
+    whenever the index is not built yet or no tool is a confident match.
+    """
+
+    def __init__(self, embedder, top_k: int = 5, min_score: float = 0.2) -> None:
+        """
+        Args:
+            embedder: An Embedder producing L2-normalized vectors.
+            top_k: Number of tools exposed per turn.
+            min_score: If the best cosine similarity is below this, fall back to all tools.
+        """
+        self.embedder = embedder
+        self.top_k: int = top_k
+        self.min_score: float = min_score
+        self.tools: List[Tool] = []
+        self._vectors: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def describe(tool: Tool) -> str:
+        """Text embedded for a tool: its name, description and argument schema."""
+        args = []
+        for name, info in tool.input_schema.get('properties', {}).items():
+            args.append(f"{name} ({info.get('type', 'any')}): {info.get('description', '')}")
+        return f"{tool.name}: {tool.description}\nArguments: {'; '.join(args)}"
+
+    @property
+    def ready(self) -> bool:
+        return self._vectors is not None
+
+    def build(self, tools: List[Tool]) -> None:
+        """Embed the tool catalogue. Blocking; run it off the event loop."""
+        # copy once: the caller's list may be updated in place while this runs in a thread
+        tools = list(tools)
+        self.embedder.load()
+        vectors = self.embedder.encode([self.describe(t) for t in tools]) if tools else None
+        with self._lock:
+            self.tools = tools
+            self._vectors = vectors
+        logging.info(f"Tool index built with {len(tools)} tools")
+
+    def select(self, user_input: str, tools: List[Tool]) -> List[Tool]:
+        """Return the tools to expose for `user_input`, or `tools` unchanged on fallback.
+
+        Args:
+            user_input: The user's message for this turn.
+            tools: The full catalogue, returned when selection is not possible.
+        """
+        with self._lock:
+            indexed, vectors = self.tools, self._vectors
+        if vectors is None or len(indexed) <= self.top_k:
+            return tools
+
+        query = self.embedder.encode([user_input])[0]
+        scores = vectors @ query
+        if scores.max() < self.min_score:
+            logging.info("No confident tool match; exposing the full catalogue")
+            return tools
+
+        best = np.argsort(-scores)[:self.top_k]
+        return [indexed[i] for i in best]
+
+    def recall(self, cases: List[Dict], tools: List[Tool]) -> float:
+        """Fraction of expected tools that `select` returns over a set of labelled queries.
+
+        Args:
+            cases: Items like {"query": "...", "expected": ["tool-name", ...]}.
+            tools: The full catalogue.
+        """
+        hits = total = 0
+        for case in cases:
+            selected = {t.name for t in self.select(case["query"], tools)}
+            hits += len(selected & set(case["expected"]))
+            total += len(case["expected"])
+        return hits / total if total else 1.0
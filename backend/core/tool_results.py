@@ -0,0 +1,189 @@
+from typing import Any, Dict, List, Optional
+from conversation_stores.base import ConversationStore
+from core.server import Tool
+from helpers import estimate_tokens
+import json
+import logging
+import math
+import uuid
+
+# built-in tool the model calls to page through results that were too large for the history
+READ_RESULT_TOOL = Tool(
+    "read_tool_result",
+    "Read another page of a large tool result that was truncated in the conversation",
+    {
+        "type": "object",
+        "properties": {
+            "blob_id": {"type": "string", "description": "Id of the stored result, given in the truncation note"},
+            "page": {"type": "integer", "description": "Page number to read, starting at 1"},
+        },
+        "required": ["blob_id", "page"],
+    },
+)
+# starts the note appended to a truncated result; its presence in a history means the
+# conversation has offloaded results, so READ_RESULT_TOOL is offered to the model
+TRUNCATION_NOTE = "[Result truncated:"
+
+
+class ToolResultProcessor:
+    """Turns raw MCP tool results into compact, size-bounded text for the message history.
+
+    Text and JSON content parts are extracted from the CallToolResult, JSON is optionally
+    projected onto a configured set of fields and minified, and the result is held to a
+    per-tool token budget. Results over budget are truncated in the history and the full
+    text is stored per conversation so the model can page through it with READ_RESULT_TOOL.
+    """
+
+    CHARS_PER_TOKEN = 4
+
+    def __init__(
+        self,
+        conversation_store: ConversationStore,
+        default_budget: int = 1000,
+        budgets: Optional[Dict[str, int]] = None,
+        projections: Optional[Dict[str, List[str]]] = None,
+        truncation: str = "head"
+    ) -> None:
+        """
+        Args:
+            conversation_store: Store used to keep offloaded results next to the conversation.
+            default_budget: Token budget for tools without an entry in `budgets`.
+            budgets: Per-tool token budgets.
+            projections: Per-tool lists of JSON fields to keep; dotted paths select nested fields.
+            truncation: 'head' keeps the beginning of an oversized result, 'head_tail' keeps
+                the beginning and the end.
+        """
+        if truncation not in ("head", "head_tail"):
+            raise ValueError(f"Unsupported truncation mode: {truncation}")
+        self.conversation_store = conversation_store
+        self.default_budget: int = default_budget
+        self.budgets: Dict[str, int] = budgets or {}
+        self.projections: Dict[str, List[str]] = projections or {}
+        self.truncation: str = truncation
+
+    def with_store(self, conversation_store: ConversationStore) -> "ToolResultProcessor":
+        """Return a processor with the same limits that offloads into another store."""
+        return ToolResultProcessor(conversation_store, self.default_budget, self.budgets,
+                                   self.projections, self.truncation)
+
+    def process(self, conversation_id: str, tool_name: str, result: Any) -> str:
+        """Render a tool result for the history, offloading it if it exceeds the tool's budget.
+
+        Args:
+            conversation_id: Conversation the result belongs to.
+            tool_name: Name of the tool that produced the result.
+            result: The CallToolResult returned by Server.execute_tool.
+
+        Returns:
+            Text to append to the message history.
+        """
+        text = self.render(tool_name, result)
+        budget = self.budgets.get(tool_name, self.default_budget)
+        if estimate_tokens(text) <= budget:
+            return text
+
+        page_chars = budget * self.CHARS_PER_TOKEN
+        pages = math.ceil(len(text) / page_chars)
+        blob_id = uuid.uuid4().hex[:12]
+        self.conversation_store.append(
+            self._blob_key(conversation_id, blob_id),
+            [{"role": "tool", "content": text, "page_chars": page_chars}])
+        logging.info(
+            f"Offloaded {len(text)} chars from {tool_name} to blob {blob_id} ({pages} pages)")
+
+        return (
+            f"{self._truncate(text, page_chars)}\n"
+            f"{TRUNCATION_NOTE} {len(text)} characters in {pages} pages of which this is an excerpt. "
+            f"To read more, call the tool \"{READ_RESULT_TOOL.name}\" with "
+            f"{{\"blob_id\": \"{blob_id}\", \"page\": 2}}]"
+        )
+
+    @staticmethod
+    def has_offloaded(messages: List[Dict[str, Any]]) -> bool:
+        """Whether any of `messages` is a tool result that was truncated and offloaded."""
+        return any(TRUNCATION_NOTE in str(message.get("content", "")) for message in messages)
+
+    def read_page(self, conversation_id: str, blob_id: str, page: int) -> str:
+        """Return one page of an offloaded result.
+
+        Raises:
+            ValueError: If the blob does not exist in this conversation or the page is out of range.
+        """
+        stored = self.conversation_store.load(self._blob_key(conversation_id, blob_id))
+        if not stored:
+            raise ValueError(f"No stored tool result with id {blob_id}")
+        text = stored[0]["content"]
+        page_chars = stored[0]["page_chars"]
+        pages = math.ceil(len(text) / page_chars)
+        if not 1 <= page <= pages:
+            raise ValueError(f"Page {page} out of range; result {blob_id} has {pages} pages")
+        chunk = text[(page - 1) * page_chars:page * page_chars]
+        return f"[Page {page} of {pages} of result {blob_id}]\n{chunk}"
+
+    def render(self, tool_name: str, result: Any) -> str:
+        """Extract text and JSON parts from a tool result and minify them."""
+        parts = []
+        structured = getattr(result, "structuredContent", None)
+        if structured is not None:
+            parts.append(self._compact_json(tool_name, structured))
+        else:
+            for item in getattr(result, "content", None) or []:
+                item_type = getattr(item, "type", None)
+                if item_type == "text":
+                    parts.append(self._compact_text(tool_name, item.text))
+                elif item_type == "resource" and getattr(item.resource, "text", None):
+                    parts.append(self._compact_text(tool_name, item.resource.text))
+                elif item_type in ("image", "audio"):
+                    parts.append(f"[{item_type}: {getattr(item, 'mimeType', 'unknown')}]")
+            if not parts and not hasattr(result, "content"):
+                parts.append(self._compact_text(tool_name, str(result)))
+
+        text = "\n".join(parts)
+        if getattr(result, "isError", False):
+            text = f"Error: {text}"
+        return text
+
+    def _compact_text(self, tool_name: str, text: str) -> str:
+        try:
+            value = json.loads(text)
+        except (json.JSONDecodeError, TypeError):
+            return text.strip()
+        return self._compact_json(tool_name, value)
+
+    def _compact_json(self, tool_name: str, value: Any) -> str:
+        fields = self.projections.get(tool_name)
+        if fields:
+            value = self._project(value, [f.split(".") for f in fields])
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+    def _project(self, value: Any, paths: List[List[str]]) -> Any:
+        """Keep only the configured fields of every record in `value`.
+
+        A dict containing at least one configured top-level field is treated as a record;
+        other dicts keep their scalar values and are searched recursively for records.
+        """
+        if isinstance(value, list):
+            return [self._project(v, paths) for v in value]
+        if not isinstance(value, dict):
+            return value
+        if any(path[0] in value for path in paths):
+            record = {}
+            for head in dict.fromkeys(path[0] for path in paths):
+                if head not in value:
+                    continue
+                rest = [path[1:] for path in paths if path[0] == head and len(path) > 1]
+                record[head] = self._project(value[head], rest) if rest else value[head]
+            return record
+        return {k: self._project(v, paths) if isinstance(v, (dict, list)) else v
+                for k, v in value.items()}
+
+    def _truncate(self, text: str, chars: int) -> str:
+        if self.truncation == "head_tail":
+            head = chars * 2 // 3
+            tail = chars - head
+            return f"{text[:head]}\n...\n{text[-tail:]}"
+        return text[:chars]
+
+    @staticmethod
+    def _blob_key(conversation_id: str, blob_id: str) -> str:
+        return f"{conversation_id}/tool-results/{blob_id}"
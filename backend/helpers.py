@@ -18,3 +18,17 @@ def load_config_with_env(path: str) -> Dict[str, Any]:
     substituted = re.sub(r"\$\{(\w+)\}", lambda m: os.getenv(m.group(1), ""), raw)
 
     return json.loads(substituted)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of LLM tokens in a string.
+
+    Uses tiktoken's cl100k_base encoding when it is installed and falls back to the
+    common ~4 characters per token approximation otherwise.
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return max(1, len(text) // 4) if text else 0
+    return len(tiktoken.get_encoding("cl100k_base").encode(text))
@@ -0,0 +1,98 @@
+"""
+Host-local MCP sidecar.
+
+Runs every MCP server from servers_config.json once per host and serves tool listing and
+tool execution to the uvicorn workers over a Unix socket, so N workers share one set of
+MCP subprocesses instead of spawning N copies (including one `docker run` per worker).
+
+Usage:
+    python mcp_sidecar.py  # listens on $MCP_SIDECAR_SOCKET (default /tmp/mcp-sidecar.sock)
+"""
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Dict
+from helpers import load_config_with_env
+from core import Configuration, Server
+
+
+class MCPSidecar:
+    """Owns the MCP server connections and answers requests from worker processes."""
+
+    def __init__(self, servers: Dict[str, Server], socket_path: str) -> None:
+        self.servers = servers
+        self.socket_path = socket_path
+
+    async def start(self) -> asyncio.AbstractServer:
+        for server in self.servers.values():
+            await server.initialize()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        unix_server = await asyncio.start_unix_server(self._handle_connection, path=self.socket_path)
+        logging.info(f"MCP sidecar listening on {self.socket_path}")
+        return unix_server
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        async def respond(request: Dict[str, Any]) -> None:
+            response: Dict[str, Any] = {"id": request.get("id")}
+            try:
+                response["result"] = await self._dispatch(request["method"], request.get("params", {}))
+            except Exception as e:
+                response["error"] = str(e)
+            async with write_lock:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                # handle each request concurrently so one slow tool does not block the worker's other calls
+                task = asyncio.create_task(respond(json.loads(line)))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _dispatch(self, method: str, params: Dict[str, Any]) -> Any:
+        server = self.servers.get(params.get("server"))
+        if server is None:
+            raise ValueError(f"Unknown MCP server: {params.get('server')}")
+        if method == "list_tools":
+            tools = await server.list_tools()
+            return [{"name": t.name, "description": t.description, "inputSchema": t.input_schema} for t in tools]
+        elif method == "call_tool":
+            result = await server.execute_tool(params["tool"], params.get("arguments", {}))
+            return result.model_dump(mode="json")
+        else:
+            raise ValueError(f"Unsupported sidecar method: {method}")
+
+    async def cleanup(self) -> None:
+        await asyncio.gather(*(s.cleanup() for s in self.servers.values()), return_exceptions=True)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+async def main() -> None:
+    Configuration.load_env()
+    server_config = load_config_with_env('servers_config.json')
+    servers = {name: Server(name, srv_config)
+               for name, srv_config in server_config['mcpServers'].items()}
+    sidecar = MCPSidecar(servers, os.getenv("MCP_SIDECAR_SOCKET") or "/tmp/mcp-sidecar.sock")
+    unix_server = await sidecar.start()
+    try:
+        async with unix_server:
+            await unix_server.serve_forever()
+    finally:
+        await sidecar.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,9 +1,21 @@
-from fastapi import FastAPI, Request
-from fastapi.responses import StreamingResponse
+from fastapi import FastAPI, Request, HTTPException, Depends
+from fastapi.responses import StreamingResponse, JSONResponse, PlainTextResponse, FileResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.background import BackgroundTask
 import logging
 import asyncio
+import hmac
+import os
+import json
+import re
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from chatbot_setup import create_chat_session
+from core import ChatSession, AdmissionController, AdmissionRejected
+from core.batch import BatchProgress, BatchRunner
+from core.diagnostics import LoopLagMonitor, SamplingProfiler, DeterministicProfiler, tracemalloc_diff
+from core.reload import HotReloader
 
 # initialize fastAPI app instance
 app = FastAPI()
@@ -20,14 +32,59 @@ app.add_middleware(
 # single ChatSession instance used across all requests
 chat_session = create_chat_session()
 
+# adaptive concurrency limit and fair wait queue in front of chat_once
+admission = AdmissionController(
+    initial_limit=int(os.getenv("ADMISSION_INITIAL_LIMIT") or "8"),
+    max_limit=int(os.getenv("ADMISSION_MAX_LIMIT") or "64"),
+    max_queue=int(os.getenv("ADMISSION_MAX_QUEUE") or "100"),
+    max_queue_per_client=int(os.getenv("ADMISSION_MAX_QUEUE_PER_CLIENT") or "10"),
+    target_latency=float(os.getenv("ADMISSION_TARGET_LATENCY") or "30")
+)
+# how long a request may wait in the queue when the client sends no deadline
+DEFAULT_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT") or "10")
+
+# records event loop stalls and the stack that caused them
+loop_lag_monitor = LoopLagMonitor(
+    threshold=float(os.getenv("LOOP_LAG_THRESHOLD_MS") or "100") / 1000,
+    asyncio_debug=(os.getenv("ASYNCIO_DEBUG") or "false").lower() == "true"
+)
+# at most one on-demand CPU profile runs at a time
+active_profiler = None
+
+# batch jobs started through the HTTP API in this worker, by job id
+BATCH_JOBS_DIR = os.getenv("BATCH_JOBS_DIR") or "batch_jobs"
+BATCH_JOB_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+batch_jobs = {}
+# worker threads for LLM calls and retrieval, shared by /chat and batch jobs
+BLOCKING_IO_THREADS = int(os.getenv("BLOCKING_IO_THREADS") or "64")
+# batch jobs bypass admission control; keep their combined concurrency well below the
+# thread pool so interactive /chat requests always find free threads and LLM connections
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY") or str(max(1, BLOCKING_IO_THREADS // 4)))
+
+# applies servers_config.json and corpus changes in place; servers live in the sidecar when one is used
+hot_reloader = HotReloader(
+    chat_session,
+    drain_timeout=float(os.getenv("HOT_RELOAD_DRAIN_TIMEOUT") or "60"),
+    reload_servers=not os.getenv("MCP_SIDECAR_SOCKET")
+)
+HOT_RELOAD_INTERVAL = float(os.getenv("HOT_RELOAD_INTERVAL") or "0")
+
 
 @app.on_event("startup")
 async def startup_event():
     """
     Called once when the FastAPI app starts up. 
     Initializes all MCP servers and prepares the chat session with system context.
+    Heavy vector store initialization runs in the background; see /ready.
     """
+    # LLM calls and retrieval run in worker threads; size the pool for concurrent conversations
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=BLOCKING_IO_THREADS))
+    loop_lag_monitor.start()
     await chat_session.initialize()
+    app.state.warm_up_task = asyncio.create_task(chat_session.warm_up())
+    if HOT_RELOAD_INTERVAL > 0:
+        hot_reloader.start(HOT_RELOAD_INTERVAL)
 
 
 @app.on_event("shutdown")
@@ -36,32 +93,297 @@ async def shutdown_event():
     Called when the FastAPI app shuts down. 
     Ensures all server subprocesses and resources are cleaned up.
     """
+    loop_lag_monitor.stop()
+    await hot_reloader.stop()
     await chat_session.cleanup_servers()
 
 
+@app.get("/health")
+async def health():
+    """
+    Liveness probe. Returns 200 as soon as the process is serving requests.
+    """
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready():
+    """
+    Readiness probe. Returns 200 once MCP servers and the vector store are initialized,
+    503 with the per-component status otherwise.
+    """
+    components = chat_session.readiness()
+    is_ready = all(components.values())
+    return JSONResponse(
+        {"ready": is_ready, "components": components},
+        status_code=200 if is_ready else 503
+    )
+
+
+@app.get("/metrics")
+async def metrics():
+    """
+    Admission control metrics: adaptive limit, in-flight requests, queue depth,
+    queue wait times and rejection counters.
+    """
+    return {"admission": admission.metrics()}
+
+
+def require_admin(request: Request) -> None:
+    """
+    Guard for /admin endpoints. They are disabled unless ADMIN_TOKEN is set,
+    and then require a matching X-Admin-Token header.
+    """
+    token = os.getenv("ADMIN_TOKEN")
+    supplied = request.headers.get("x-admin-token") or ""
+    # constant-time comparison, so response timing does not reveal the token
+    if not token or not hmac.compare_digest(supplied.encode(), token.encode()):
+        raise HTTPException(status_code=403, detail="Admin access denied")
+
+
+@app.get("/admin/loop-lag", dependencies=[Depends(require_admin)])
+async def loop_lag():
+    """
+    Recent event loop stalls longer than the threshold, with the blocking stack of each.
+    """
+    return loop_lag_monitor.report()
+
+
+@app.post("/admin/profile/start", dependencies=[Depends(require_admin)])
+async def start_profile(mode: str = "sampling", interval_ms: float = 5.0):
+    """
+    Start a CPU profile. mode is "sampling" (busy threads, low overhead, folded stacks)
+    or "cprofile" (deterministic, event loop thread only).
+    """
+    global active_profiler
+    if active_profiler is not None:
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    if mode == "sampling":
+        if not interval_ms > 0:
+            raise HTTPException(status_code=400, detail="interval_ms must be greater than 0")
+        active_profiler = SamplingProfiler(interval=interval_ms / 1000)
+    elif mode == "cprofile":
+        active_profiler = DeterministicProfiler()
+    else:
+        raise HTTPException(status_code=400, detail=f"Unsupported profile mode: {mode}")
+    active_profiler.start()
+    return {"status": "started", "mode": mode}
+
+
+@app.post("/admin/profile/stop", dependencies=[Depends(require_admin)])
+async def stop_profile():
+    """
+    Stop the running profile. Sampling profiles are returned as folded stacks
+    (flamegraph.pl / speedscope input), cProfile as a pstats report.
+    """
+    global active_profiler
+    if active_profiler is None:
+        raise HTTPException(status_code=409, detail="No profile is running")
+    profiler, active_profiler = active_profiler, None
+    # stop on the loop thread: cProfile can only be disabled from the thread it profiles
+    return PlainTextResponse(profiler.stop())
+
+
+@app.get("/admin/memory", dependencies=[Depends(require_admin)])
+async def memory_diff(seconds: float = 30.0, limit: int = 25):
+    """
+    Trace allocations for the given window and return the sites whose memory grew the most.
+    """
+    try:
+        top = await tracemalloc_diff(seconds, limit)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"seconds": seconds, "top": top}
+
+
+@app.post("/admin/reload", dependencies=[Depends(require_admin)])
+async def reload():
+    """
+    Apply changes to servers_config.json without a restart: start added servers, restart
+    changed ones, then drain and stop the ones that were removed or replaced. Also starts
+    a background re-index of any corpus that changed on disk.
+    """
+    servers = None
+    if hot_reloader.reload_servers_enabled:
+        try:
+            servers = await hot_reloader.reload_servers()
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Server reload failed: {e}")
+    return {"servers": servers, "reindexing": hot_reloader.reindex()}
+
+
+def batch_jobs_path(path: str) -> str:
+    """
+    Resolve a client-supplied batch file path inside BATCH_JOBS_DIR.
+    Relative paths are taken from BATCH_JOBS_DIR; anything resolving outside it is rejected.
+    """
+    root = os.path.realpath(BATCH_JOBS_DIR)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise HTTPException(status_code=400, detail=f"Batch files must be inside {BATCH_JOBS_DIR}")
+    return resolved
+
+
+@app.post("/batch/jobs", dependencies=[Depends(require_admin)])
+async def create_batch_job(request: Request):
+    """
+    Start a batch job. Expects {"input_path": "..."} pointing at a JSONL file in
+    BATCH_JOBS_DIR, or {"conversations": [{"id": "...", "messages": ["..."]}, ...]} inline.
+    Optional "output_path" (in BATCH_JOBS_DIR; resumes if it already exists) and "concurrency".
+    The concurrency of all running jobs together may not exceed BATCH_MAX_CONCURRENCY.
+    """
+    body = await request.json()
+    job_id = str(body.get("job_id") or uuid.uuid4().hex[:12])
+    if not BATCH_JOB_ID.match(job_id):
+        raise HTTPException(status_code=400, detail="job_id may only contain letters, digits, '-' and '_'")
+    try:
+        concurrency = int(body.get("concurrency", 8))
+    except (TypeError, ValueError):
+        concurrency = 0
+    if concurrency < 1:
+        raise HTTPException(status_code=400, detail="concurrency must be a positive integer")
+    if job_id in batch_jobs and batch_jobs[job_id]["progress"].status == "running":
+        raise HTTPException(status_code=409, detail=f"Batch job {job_id} is already running")
+    in_use = sum(job["concurrency"] for job in batch_jobs.values() if not job["task"].done())
+    if in_use + concurrency > BATCH_MAX_CONCURRENCY:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Batch concurrency {concurrency} exceeds the {BATCH_MAX_CONCURRENCY - in_use} available")
+
+    os.makedirs(BATCH_JOBS_DIR, exist_ok=True)
+    input_path = body.get("input_path")
+    if input_path is not None:
+        input_path = batch_jobs_path(str(input_path))
+        if not os.path.isfile(input_path):
+            raise HTTPException(status_code=400, detail=f"Input file not found: {body['input_path']}")
+    else:
+        conversations = body.get("conversations")
+        if not conversations:
+            raise HTTPException(status_code=400, detail="input_path or conversations is required")
+        input_path = os.path.join(BATCH_JOBS_DIR, f"{job_id}.input.jsonl")
+        with open(input_path, "w") as f:
+            for conversation in conversations:
+                f.write(json.dumps(conversation) + "\n")
+    output_path = batch_jobs_path(str(body.get("output_path") or f"{job_id}.jsonl"))
+
+    progress = BatchProgress()
+    runner = BatchRunner(chat_session, concurrency=concurrency)
+    task = asyncio.create_task(runner.run(input_path, output_path, progress))
+    # failures are recorded on the progress object
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    batch_jobs[job_id] = {"progress": progress, "output_path": output_path, "task": task,
+                          "concurrency": concurrency}
+    return {"job_id": job_id, "output_path": output_path}
+
+
+@app.get("/batch/jobs/{job_id}", dependencies=[Depends(require_admin)])
+async def get_batch_job(job_id: str):
+    """
+    Progress of a batch job started by this worker.
+    """
+    if job_id not in batch_jobs:
+        raise HTTPException(status_code=404, detail=f"Unknown batch job: {job_id}")
+    return {"job_id": job_id, **batch_jobs[job_id]["progress"].to_dict()}
+
+
+@app.get("/batch/jobs/{job_id}/results", dependencies=[Depends(require_admin)])
+async def get_batch_results(job_id: str):
+    """
+    Results written so far, as JSONL.
+    """
+    if job_id not in batch_jobs or not os.path.exists(batch_jobs[job_id]["output_path"]):
+        raise HTTPException(status_code=404, detail=f"No results for batch job: {job_id}")
+    return FileResponse(batch_jobs[job_id]["output_path"], media_type="application/x-ndjson")
+
+
+def request_deadline(request: Request) -> float:
+    """
+    Convert the client's deadline into a time.monotonic() value.
+    Accepts X-Request-Deadline (unix epoch seconds) or X-Request-Timeout (seconds from now).
+    """
+    try:
+        if "x-request-deadline" in request.headers:
+            return time.monotonic() + float(request.headers["x-request-deadline"]) - time.time()
+        timeout = float(request.headers.get(
+            "x-request-timeout", DEFAULT_QUEUE_TIMEOUT))
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail="X-Request-Deadline and X-Request-Timeout must be numbers of seconds")
+    return time.monotonic() + timeout
+
+
 @app.post("/chat")
 async def chat(request: Request):
     """
     POST endpoint for interacting with the chatbot. 
-    Expects a JSON payload like {"message": "Hi!"}
+    Expects a JSON payload like {"message": "Hi!", "conversation_id": "..."}
+    The conversation_id is optional; any worker can serve any conversation because
+    history lives in the configured conversation store. Optional "collection" and
+    "filters" fields scope retrieval, ex. {"filters": {"tenant": "acme"}}.
     Streams the assistant's reply word by word using a StreamingResponse
+
+    Requests pass through admission control first: when the server is saturated they
+    queue (fairly per client, keyed on X-Client-ID or the remote address) until their
+    deadline, and are rejected with 503/429 and Retry-After when they cannot be served.
     """
     if not chat_session.system_message:
         logging.warning("ChatSession not initialized before first request")
 
     body = await request.json()
     user_input = body.get("message", "")
+    conversation_id = body.get(
+        "conversation_id", ChatSession.DEFAULT_CONVERSATION_ID)
+
+    client_id = request.headers.get("x-client-id") or (
+        request.client.host if request.client else "unknown")
+    try:
+        await admission.acquire(client_id, request_deadline(request))
+    except AdmissionRejected as e:
+        return JSONResponse(
+            {"error": e.reason},
+            status_code=e.status_code,
+            headers={"Retry-After": str(int(e.retry_after + 0.999))}
+        )
+
+    # seconds spent producing the reply, excluding the time spent streaming it to the client
+    work_time = 0.0
+    released = False
+
+    def release(ok: bool, record: bool = True) -> None:
+        """Return the admission slot exactly once, whichever path finishes the request."""
+        nonlocal released
+        if not released:
+            released = True
+            admission.release(work_time, ok, record)
 
     async def streamer():
         """
         Async generator that returns the assistant's response word by word.
         Simulates real-time streaming behavior. 
+        Holds the admission slot until the stream finishes.
         """
-        # send user's full message to LLM + tool execution
-        async for message in chat_session.chat_once(user_input):
-            for word in message.split():
-                yield word + " "
-                await asyncio.sleep(0.05)  # simulate streaming response
+        nonlocal work_time
+        # None while running or when the client goes away; disconnects say nothing about load
+        ok = None
+        try:
+            # send user's full message to LLM + tool execution
+            resumed = time.monotonic()
+            async for message in chat_session.chat_once(
+                    user_input, conversation_id, body.get("collection"), body.get("filters")):
+                work_time += time.monotonic() - resumed
+                for word in message.split():
+                    yield word + " "
+                    await asyncio.sleep(0.05)  # simulate streaming response
+                resumed = time.monotonic()
+            work_time += time.monotonic() - resumed
+            ok = True
+        except Exception:
+            ok = False
+            raise
+        finally:
+            release(bool(ok), record=ok is not None)
     # generator function passed to StreamingResponse
     # client receives output word by word as soon as the first one is available
-    return StreamingResponse(streamer(), media_type="text/plain")
+    # the background task frees the slot if the client disconnects before streaming starts
+    return StreamingResponse(streamer(), media_type="text/plain",
+                             background=BackgroundTask(release, False, record=False))
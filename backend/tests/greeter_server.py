@@ -0,0 +1,16 @@
+"""Minimal stdio MCP server used by the hot reload tests."""
+import os
+
+from mcp.server.fastmcp import FastMCP
+
+app = FastMCP("greeter")
+
+
+@app.tool()
+def greet() -> str:
+    """Return the configured greeting."""
+    return os.environ.get("GREETING", "hello")
+
+
+if __name__ == "__main__":
+    app.run()
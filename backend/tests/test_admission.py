@@ -0,0 +1,121 @@
+"""
+AdmissionController queueing, fairness and AIMD limit adaptation.
+
+Run from the backend directory: python -m pytest tests
+"""
+import asyncio
+import time
+
+import pytest
+
+from core import AdmissionController, AdmissionRejected
+
+
+def later(seconds: float = 10.0) -> float:
+    return time.monotonic() + seconds
+
+
+def test_queued_clients_are_served_round_robin():
+    async def main():
+        admission = AdmissionController(initial_limit=1)
+        await admission.acquire("holder", later())
+        order = []
+
+        async def request(client_id: str, label: str) -> None:
+            await admission.acquire(client_id, later())
+            order.append(label)
+
+        tasks = []
+        for client_id, label in [("a", "a1"), ("a", "a2"), ("a", "a3"), ("b", "b1")]:
+            tasks.append(asyncio.create_task(request(client_id, label)))
+            await asyncio.sleep(0)
+        assert admission.queue_depth == 4
+
+        for _ in range(4):
+            admission.release(0.1)
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        assert order == ["a1", "b1", "a2", "a3"]
+
+    asyncio.run(main())
+
+
+def test_expired_deadlines_are_rejected_and_never_started():
+    async def main():
+        admission = AdmissionController(initial_limit=1)
+        with pytest.raises(AdmissionRejected) as raised:
+            await admission.acquire("a", time.monotonic())
+        assert raised.value.status_code == 503
+
+        await admission.acquire("holder", later())
+        # times out while waiting in the queue
+        with pytest.raises(AdmissionRejected):
+            await admission.acquire("a", later(0.05))
+        assert admission.queue_depth == 0
+
+        # expires while queued and is skipped by the dispatcher in favour of the next client
+        short = asyncio.create_task(admission.acquire("a", later(0.05)))
+        patient = asyncio.create_task(admission.acquire("b", later()))
+        await asyncio.sleep(0)
+        time.sleep(0.1)
+        admission.release(0.1)
+        with pytest.raises(AdmissionRejected):
+            await short
+        await patient
+        assert admission.inflight == 1
+        assert admission.metrics()["expired"] == 3
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiter_returns_a_slot_it_was_granted():
+    async def main():
+        admission = AdmissionController(initial_limit=1)
+        await admission.acquire("holder", later())
+        waiter = asyncio.create_task(admission.acquire("a", later()))
+        await asyncio.sleep(0)
+
+        # the slot is handed over, but the request is cancelled before it resumes
+        admission.release(0.1)
+        assert admission.inflight == 1
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert admission.inflight == 0
+        assert admission.queue_depth == 0
+        await admission.acquire("b", later())
+
+    asyncio.run(main())
+
+
+def test_limit_grows_additively_and_shrinks_multiplicatively():
+    async def main():
+        admission = AdmissionController(initial_limit=2, min_limit=1, max_limit=4,
+                                        target_latency=1.0, decrease_factor=0.5)
+        await admission.acquire("a", later())
+        admission.release(0.1)
+        # not saturated: fast requests do not grow the limit
+        assert admission.limit == 2.0
+
+        await admission.acquire("a", later())
+        await admission.acquire("a", later())
+        admission.release(0.1)
+        assert admission.limit == 2.5
+        admission.release(0.1)
+        assert admission.limit == 2.5
+
+        await admission.acquire("a", later())
+        admission.release(0.1, ok=False)
+        assert admission.limit == 1.25
+        # at most one decrease per target_latency window
+        await admission.acquire("a", later())
+        admission.release(5.0)
+        assert admission.limit == 1.25
+
+        admission._last_decrease -= 2.0
+        await admission.acquire("a", later())
+        admission.release(5.0)
+        assert admission.limit == 1.0
+        assert admission.metrics()["failed"] == 1
+
+    asyncio.run(main())
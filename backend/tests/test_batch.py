@@ -0,0 +1,126 @@
+"""
+Batch runner checkpointing, resume and batched retrieval, with stub LLM and vector store clients.
+
+Run from the backend directory: python -m pytest tests
+"""
+import asyncio
+import json
+
+import numpy as np
+
+from conversation_stores.memory import InMemoryConversationStore
+from core import ChatSession, ToolResultProcessor
+from core.batch import BatchRunner
+from vector_stores.base import BatchQueryResult
+
+
+class EchoLLM:
+    """Replies "re: <last user message>", declines every tool call, and fails on demand."""
+
+    def __init__(self, failing=()) -> None:
+        self.failing = set(failing)
+
+    def get_response(self, messages):
+        if messages[-1]["role"] == "system":
+            return "null"
+        text = messages[-1]["content"]
+        if text in self.failing:
+            raise RuntimeError(f"LLM unavailable for {text}")
+        return f"re: {text}"
+
+
+class StubStore:
+    """Finds a document only for queries containing "park"; counts both query paths."""
+
+    def __init__(self, ready: bool = True) -> None:
+        self.ready = ready
+        self.batched = 0
+        self.queried = []
+
+    def query_batch(self, texts, top_k=5, filters=None, collection=None):
+        self.batched += 1
+        ids = np.array([[0 if "park" in t else -1] for t in texts], dtype="int64")
+        return BatchQueryResult(np.zeros(ids.shape, dtype="float32"), ids, lambda i: {"text": "Yosemite"})
+
+    def query(self, text, top_k=5, filters=None, collection=None):
+        self.queried.append(text)
+        return []
+
+
+def new_session(llm, vector_store=None) -> ChatSession:
+    store = InMemoryConversationStore()
+    return ChatSession([], llm, vector_store, store, None, ToolResultProcessor(store))
+
+
+def write_jsonl(path, records) -> None:
+    with open(path, "w") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def read_jsonl(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+CONVERSATIONS = [
+    {"id": "a", "messages": ["hi a", "bye a"]},
+    {"id": "b", "messages": ["hi b"]},
+    {"id": "c", "messages": ["hi c"]},
+]
+
+
+def test_resume_retries_failures_and_compacts(tmp_path):
+    input_path, output_path = tmp_path / "in.jsonl", str(tmp_path / "out.jsonl")
+    write_jsonl(input_path, CONVERSATIONS)
+
+    first = asyncio.run(BatchRunner(new_session(EchoLLM(failing={"hi b"})), concurrency=2)
+                        .run(str(input_path), output_path))
+    assert (first.status, first.completed, first.failed) == ("completed", 2, 1)
+    assert BatchRunner.completed_ids(output_path) == {"a", "c"}
+
+    second = asyncio.run(BatchRunner(new_session(EchoLLM()), concurrency=2)
+                         .run(str(input_path), output_path))
+    assert (second.skipped, second.completed, second.failed) == (2, 1, 0)
+
+    records = {r["id"]: r for r in read_jsonl(output_path)}
+    assert len(read_jsonl(output_path)) == 3
+    assert "error" not in records["b"]
+    assert records["b"]["turns"][0]["responses"] == ["re: hi b"]
+    assert [t["responses"] for t in records["a"]["turns"]] == [["re: hi a"], ["re: bye a"]]
+
+
+def test_last_record_wins(tmp_path):
+    output_path = str(tmp_path / "out.jsonl")
+    write_jsonl(output_path, [
+        {"id": "a", "turns": []},
+        {"id": "b", "turns": [], "error": "timeout"},
+        {"id": "a", "turns": [], "error": "timeout"},
+        {"id": "b", "turns": []},
+    ])
+    with open(output_path, "a") as f:
+        # torn line from an interrupted run
+        f.write('{"id": "c", "tur')
+
+    assert BatchRunner.completed_ids(output_path) == {"b"}
+    BatchRunner.compact(output_path)
+    assert read_jsonl(output_path) == [
+        {"id": "a", "turns": [], "error": "timeout"},
+        {"id": "b", "turns": []},
+    ]
+
+
+def test_prefetch_leaves_empty_rows_and_cold_stores_to_per_turn_queries():
+    conversations = [{"id": "a", "messages": ["a park", "nothing"]}]
+
+    warm = StubStore()
+    asyncio.run(BatchRunner(new_session(EchoLLM(), warm))._prefetch_retrieval(conversations))
+    assert conversations[0]["_retrieved"] == {0: [{"text": "Yosemite"}], 1: None}
+
+    cold = StubStore(ready=False)
+    conversations = [{"id": "b", "messages": ["a park"]}]
+    runner = BatchRunner(new_session(EchoLLM(), cold))
+    asyncio.run(runner._prefetch_retrieval(conversations))
+    assert cold.batched == 0 and "_retrieved" not in conversations[0]
+    asyncio.run(runner._run_conversation(conversations[0]))
+    assert cold.queried == ["a park"]
@@ -0,0 +1,41 @@
+"""
+Sampling profiler thread selection.
+
+Run from the backend directory: python -m pytest tests
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core.diagnostics import SamplingProfiler
+
+
+def busy_loop(seconds: float) -> None:
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+
+
+def test_sampler_skips_idle_threads():
+    executor = ThreadPoolExecutor(max_workers=4)
+    # every worker is started, then parks waiting for work
+    list(executor.map(lambda _: None, range(4)))
+    parked = threading.Event()
+    waiter = threading.Thread(target=parked.wait, daemon=True)
+    waiter.start()
+    try:
+        profiler = SamplingProfiler(interval=0.005)
+        profiler.start()
+        busy = threading.Thread(target=busy_loop, args=(0.3,))
+        busy.start()
+        busy.join()
+        stacks = profiler.stop().splitlines()
+    finally:
+        parked.set()
+        executor.shutdown()
+
+    assert any("busy_loop" in stack for stack in stacks)
+    assert not any("_worker" in stack for stack in stacks)
+    # the only stacks ending in a wait are the starting (event loop) thread's
+    waits = [stack for stack in stacks if stack.rsplit(";", 1)[-1].startswith("wait ")]
+    assert all("test_sampler_skips_idle_threads" in stack for stack in waits)
@@ -0,0 +1,128 @@
+"""
+Hot reload of servers_config.json against real stdio MCP servers.
+
+Run from the backend directory: python -m pytest tests
+"""
+import asyncio
+import json
+import os
+import sys
+
+from conversation_stores.memory import InMemoryConversationStore
+from core import ChatSession, Server, ToolResultProcessor
+from core.reload import HotReloader
+
+GREETER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "greeter_server.py")
+
+
+def greeter_config(greeting: str) -> dict:
+    return {"command": sys.executable, "args": [GREETER], "env": {"GREETING": greeting}}
+
+
+def write_config(path, servers: dict) -> None:
+    with open(path, "w") as f:
+        json.dump({"mcpServers": servers}, f)
+
+
+def new_session(servers) -> ChatSession:
+    store = InMemoryConversationStore()
+    return ChatSession(servers, None, None, store, None, ToolResultProcessor(store))
+
+
+def test_restarting_a_boot_time_server_keeps_other_tasks_alive(tmp_path):
+    config_path = tmp_path / "servers_config.json"
+    write_config(config_path, {"greeter": greeter_config("hello")})
+
+    async def main():
+        session = new_session([Server("greeter", greeter_config("hello"))])
+        booted, shutdown = asyncio.Event(), asyncio.Event()
+        cleaned_up = False
+
+        async def lifespan():
+            # stands in for uvicorn's lifespan task: boots the servers, cleans them up on exit
+            nonlocal cleaned_up
+            await session.initialize()
+            booted.set()
+            await shutdown.wait()
+            await session.cleanup_servers()
+            cleaned_up = True
+
+        lifespan_task = asyncio.create_task(lifespan())
+        await booted.wait()
+        boot_server = session.servers[0]
+        assert boot_server.session is not None
+
+        reloader = HotReloader(session, str(config_path), drain_timeout=5)
+        write_config(config_path, {"greeter": greeter_config("hello again")})
+        summary = await reloader.reload_servers()
+        assert summary == {"added": [], "removed": [], "restarted": ["greeter"]}
+
+        # the boot-time server is stopped from the reloader's drain task
+        await asyncio.gather(*reloader._drain_tasks)
+        assert boot_server.session is None
+        await asyncio.sleep(0.1)
+        assert not lifespan_task.done()
+
+        new_server = session.servers[0]
+        assert new_server is not boot_server
+        result = await session.tool_servers["greet"].execute_tool("greet", {})
+        assert result.content[0].text == "hello again"
+
+        shutdown.set()
+        await lifespan_task
+        assert cleaned_up
+        assert new_server.session is None
+
+    asyncio.run(main())
+
+
+def test_unparseable_config_is_retried_on_the_next_check(tmp_path):
+    config_path = tmp_path / "servers_config.json"
+    write_config(config_path, {})
+
+    async def main():
+        session = new_session([])
+        reloader = HotReloader(session, str(config_path))
+        # a half-written file: the change must not be marked as applied
+        config_path.write_text('{"mcpServers": {"greeter": ')
+        os.utime(config_path, (1, 1))
+        await reloader.check()
+        assert session.servers == []
+
+        write_config(config_path, {"greeter": greeter_config("hello")})
+        os.utime(config_path, (1, 1))
+        await reloader.check()
+        try:
+            assert [s.name for s in session.servers] == ["greeter"]
+        finally:
+            await session.cleanup_servers()
+
+    asyncio.run(main())
+
+
+def test_stop_stops_draining_servers_without_waiting(tmp_path):
+    config_path = tmp_path / "servers_config.json"
+    write_config(config_path, {"greeter": greeter_config("hello")})
+
+    async def main():
+        session = new_session([Server("greeter", greeter_config("hello"))])
+        await session.initialize()
+        boot_server = session.servers[0]
+        # a tool call that never finishes keeps the retired server draining
+        session.active_calls[boot_server] += 1
+
+        reloader = HotReloader(session, str(config_path), drain_timeout=60)
+        reloader.start(interval=60)
+        write_config(config_path, {"greeter": greeter_config("hello again")})
+        await reloader.reload_servers()
+        await asyncio.sleep(0.2)
+        assert boot_server.session is not None
+
+        try:
+            await asyncio.wait_for(reloader.stop(), timeout=5)
+            assert boot_server.session is None
+            assert not reloader._drain_tasks
+        finally:
+            await session.cleanup_servers()
+
+    asyncio.run(main())
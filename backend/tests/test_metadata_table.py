@@ -0,0 +1,49 @@
+"""
+Metadata filtering in the local vector store's columnar side table.
+
+Run from the backend directory: python -m pytest tests
+"""
+import pytest
+
+from vector_stores.collections import MetadataTable
+
+DOCUMENTS = [
+    {"text": "a", "park": "yosemite", "year": 1890, "tags": ["hiking", "climbing"], "geo": {"lat": 37.8}},
+    {"text": "b", "park": "zion", "year": 1919, "tags": ["hiking"]},
+    {"text": "c", "park": "acadia", "year": 1916, "tags": "coast"},
+    {"text": "d", "zip": "02132"},
+]
+
+
+def test_rows_round_trip_structured_values():
+    table = MetadataTable(DOCUMENTS)
+    assert table.row(0) == {"park": "yosemite", "year": 1890,
+                            "tags": ["hiking", "climbing"], "geo": {"lat": 37.8}}
+    assert table.row(3) == {"zip": "02132"}
+    # rows do not share mutable values
+    table.row(0)["tags"].append("changed")
+    assert table.row(0)["tags"] == ["hiking", "climbing"]
+
+
+def test_scalar_and_range_filters():
+    table = MetadataTable(DOCUMENTS)
+    assert table.select({"park": "zion"}).tolist() == [1]
+    assert table.select({"park": ["zion", "acadia"]}).tolist() == [1, 2]
+    assert table.select({"year": {"gte": 1900}}).tolist() == [1, 2]
+    assert table.select({"zip": "02132"}).tolist() == [3]
+    assert table.select({"missing": 1}).tolist() == []
+
+
+def test_list_fields_match_by_membership():
+    table = MetadataTable(DOCUMENTS)
+    assert table.select({"tags": "hiking"}).tolist() == [0, 1]
+    assert table.select({"tags": ["climbing", "coast"]}).tolist() == [0, 2]
+    assert table.select({"tags": "swimming"}).tolist() == []
+
+
+def test_object_fields_cannot_be_filtered():
+    table = MetadataTable(DOCUMENTS)
+    with pytest.raises(ValueError, match="object field"):
+        table.select({"geo": {"lat": 37.8}})
+    with pytest.raises(ValueError, match="object field"):
+        table.select({"geo": 37.8})
@@ -0,0 +1,204 @@
+"""
+Remote MCP transport tests against a locally launched streamable HTTP MCP server.
+
+Run from the backend directory: python -m pytest tests
+"""
+import asyncio
+import socket
+import threading
+import time
+
+import pytest
+import uvicorn
+from mcp.server.fastmcp import FastMCP
+
+from core.server import Server, _remote_pool
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def echo_app() -> FastMCP:
+    app = FastMCP("echo")
+
+    @app.tool()
+    async def echo(text: str) -> str:
+        """Return the text after a short delay."""
+        await asyncio.sleep(0.05)
+        return text
+
+    @app.tool()
+    async def slow(seconds: float) -> str:
+        """Return after `seconds`."""
+        await asyncio.sleep(seconds)
+        return "done"
+
+    return app
+
+
+def serve(app: FastMCP):
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(
+        app.streamable_http_app(), host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        assert time.monotonic() < deadline, "MCP test server did not start"
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}/mcp", server, thread
+
+
+def kill(server: uvicorn.Server, thread: threading.Thread) -> None:
+    server.should_exit = server.force_exit = True
+    thread.join(timeout=5)
+
+
+@pytest.fixture(scope="module")
+def mcp_url():
+    url, server, thread = serve(echo_app())
+    yield url
+    kill(server, thread)
+
+
+def remote_config(url: str) -> dict:
+    return {"transport": "streamable_http", "url": url, "keepalive_interval": 0}
+
+
+def result_text(result) -> str:
+    return result.content[0].text
+
+
+def test_servers_share_one_pooled_connection(mcp_url):
+    async def main():
+        first, second = Server("first", remote_config(mcp_url)), Server("second", remote_config(mcp_url))
+        await first.initialize()
+        await second.initialize()
+        try:
+            assert first.remote is second.remote
+            assert [t.name for t in await first.list_tools()] == ["echo", "slow"]
+
+            calls = [server.execute_tool("echo", {"text": str(i)})
+                     for i in range(20) for server in (first, second)]
+            results = await asyncio.gather(*calls)
+            assert [result_text(r) for r in results] == [str(i) for i in range(20) for _ in range(2)]
+        finally:
+            await first.cleanup()
+            await second.cleanup()
+        assert not _remote_pool
+
+    asyncio.run(main())
+
+
+def test_server_error_keeps_the_shared_session(mcp_url):
+    async def main():
+        server = Server("echo", remote_config(mcp_url))
+        await server.initialize()
+        try:
+            generation = server.remote.generation
+            session = server.remote.session
+
+            async def unknown_tool():
+                try:
+                    result = await server.execute_tool("no-such-tool", {})
+                    assert result.isError
+                except Exception as e:
+                    assert "no-such-tool" in str(e) or "Unknown tool" in str(e)
+
+            in_flight = [server.execute_tool("echo", {"text": "ok"}) for _ in range(5)]
+            results = await asyncio.gather(unknown_tool(), *in_flight)
+            assert all(result_text(r) == "ok" for r in results[1:])
+            assert server.remote.generation == generation
+            assert server.remote.session is session
+        finally:
+            await server.cleanup()
+
+    asyncio.run(main())
+
+
+def test_stale_failure_does_not_replace_a_fresh_session(mcp_url):
+    async def main():
+        server = Server("echo", remote_config(mcp_url))
+        await server.initialize()
+        try:
+            stale = server.remote.generation
+            await server.remote.reconnect(stale)
+            fresh = server.remote.session
+            assert server.remote.generation == stale + 1
+
+            # a second call that saw the same failure must not reconnect again
+            await server.remote.reconnect(stale)
+            assert server.remote.session is fresh
+            assert server.remote.generation == stale + 1
+            assert result_text(await server.execute_tool("echo", {"text": "after"})) == "after"
+        finally:
+            await server.cleanup()
+
+    asyncio.run(main())
+
+
+def test_dropped_connection_fails_pending_calls(mcp_url):
+    async def main():
+        server = Server("echo", remote_config(mcp_url))
+        await server.initialize()
+        try:
+            generation = server.remote.generation
+            call = asyncio.create_task(server.remote.call_tool("slow", {"seconds": 30}, timeout=60))
+            await asyncio.sleep(0.2)
+            started = time.monotonic()
+            await server.remote.reconnect(generation)
+            with pytest.raises(ConnectionError):
+                await asyncio.wait_for(call, timeout=5)
+            assert time.monotonic() - started < 5
+            assert server.remote.generation == generation + 1
+        finally:
+            await server.cleanup()
+
+    asyncio.run(main())
+
+
+def test_server_killed_mid_call_times_out():
+    url, http_server, thread = serve(echo_app())
+
+    async def main():
+        config = {**remote_config(url), "call_timeout": 1, "max_reconnect_attempts": 1}
+        server = Server("echo", config)
+        await server.initialize()
+        try:
+            call = asyncio.create_task(server.execute_tool("slow", {"seconds": 30}, delay=0.1))
+            await asyncio.sleep(0.2)
+            await asyncio.to_thread(kill, http_server, thread)
+            started = time.monotonic()
+            with pytest.raises(Exception) as raised:
+                await asyncio.wait_for(call, timeout=15)
+            assert not isinstance(raised.value, asyncio.TimeoutError)
+            assert time.monotonic() - started < 15
+        finally:
+            await server.cleanup()
+
+    try:
+        asyncio.run(main())
+    finally:
+        kill(http_server, thread)
+
+
+def test_unresponsive_endpoint_does_not_block_the_pool(mcp_url):
+    async def main():
+        # accepts connections but never answers, so connecting to it hangs
+        with socket.socket() as silent:
+            silent.bind(("127.0.0.1", 0))
+            silent.listen()
+            hanging = Server("hanging", remote_config(f"http://127.0.0.1:{silent.getsockname()[1]}/mcp"))
+            connecting = asyncio.create_task(hanging.initialize())
+            await asyncio.sleep(0.2)
+            server = Server("echo", remote_config(mcp_url))
+            await asyncio.wait_for(server.initialize(), timeout=5)
+            await server.cleanup()
+            connecting.cancel()
+            await asyncio.gather(connecting, return_exceptions=True)
+        assert not _remote_pool
+
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+"""
+ChatSession tool routing and the built-in result reader, with stub servers and LLM client.
+
+Run from the backend directory: python -m pytest tests
+"""
+import asyncio
+import json
+
+import pytest
+
+from conversation_stores.memory import InMemoryConversationStore
+from core import ChatSession, Tool, ToolResultProcessor
+from core.reload import HotReloader
+from core.tool_results import READ_RESULT_TOOL
+
+
+class StubServer:
+    """Exposes one tool whose result is `result`."""
+
+    def __init__(self, name: str, config: dict) -> None:
+        self.name = name
+        self.config = config
+        self.tool = Tool(config["tool"], "Stub tool", {})
+        self.stopped = False
+
+    async def initialize(self) -> None:
+        pass
+
+    async def list_tools(self):
+        return [self.tool]
+
+    async def execute_tool(self, tool_name, arguments):
+        return self.config.get("result", "ok")
+
+    async def cleanup(self) -> None:
+        self.stopped = True
+
+
+class ScriptedLLM:
+    """Returns the scripted replies in order and records the system prompt of every call."""
+
+    def __init__(self, replies) -> None:
+        self.replies = list(replies)
+        self.prompts = []
+
+    def get_response(self, messages):
+        self.prompts.append(messages[0]["content"])
+        return self.replies.pop(0)
+
+
+def new_session(servers, llm=None, budget: int = 1000) -> ChatSession:
+    store = InMemoryConversationStore()
+    return ChatSession(servers, llm, None, store, None, ToolResultProcessor(store, default_budget=budget))
+
+
+async def run_turn(session: ChatSession, text: str, conversation_id: str = "c"):
+    return [response async for response in session.chat_once(text, conversation_id)]
+
+
+def test_result_reader_is_offered_once_a_result_is_offloaded():
+    search_call = json.dumps({"tool": "search", "arguments": {}})
+    llm = ScriptedLLM([
+        "Let me look", search_call, "Found a lot", "null",
+        "Anything else?", "null",
+    ])
+    server = StubServer("search", {"tool": "search", "result": "park " * 500})
+
+    async def main():
+        session = new_session([server], llm, budget=50)
+        await session.initialize()
+        assert READ_RESULT_TOOL.name not in session.system_message
+
+        await run_turn(session, "find parks")
+        # not before the oversized result arrives, from the reply to it onwards
+        assert [READ_RESULT_TOOL.name in prompt for prompt in llm.prompts] == [False, False, True, True]
+
+        await run_turn(session, "thanks")
+        assert READ_RESULT_TOOL.name in llm.prompts[-1]
+        # other conversations have nothing to read
+        llm.replies.extend(["Hi", "null"])
+        await run_turn(session, "hello", conversation_id="other")
+        assert READ_RESULT_TOOL.name not in llm.prompts[-1]
+
+    asyncio.run(main())
+
+
+def test_server_exposing_a_reserved_tool_name_is_refused():
+    async def main():
+        clash = StubServer("clash", {"tool": READ_RESULT_TOOL.name})
+        session = new_session([clash])
+        with pytest.raises(RuntimeError, match="reserved"):
+            await session.initialize()
+        assert clash.stopped
+
+    asyncio.run(main())
+
+
+def test_reload_adding_a_reserved_tool_name_is_abandoned(tmp_path):
+    config_path = tmp_path / "servers_config.json"
+    config_path.write_text(json.dumps({"mcpServers": {
+        "search": {"tool": "search"},
+        "clash": {"tool": READ_RESULT_TOOL.name},
+    }}))
+
+    async def main():
+        search = StubServer("search", {"tool": "search"})
+        session = new_session([search])
+        await session.initialize()
+        started = []
+
+        def factory(name, config):
+            started.append(StubServer(name, config))
+            return started[-1]
+
+        reloader = HotReloader(session, str(config_path), server_factory=factory)
+        with pytest.raises(RuntimeError, match="reserved"):
+            await reloader.reload_servers()
+        assert session.servers == [search]
+        assert [s.stopped for s in started] == [True]
+
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+"""
+Startup budget regression test.
+
+Imports the backend and builds the chat session in a fresh interpreter, then fails if
+the time taken, the peak RSS, or the set of imported heavy SDKs exceeds the budget.
+The budgets can be tuned per environment with STARTUP_BUDGET_SECONDS and
+STARTUP_BUDGET_RSS_MB.
+
+Run from the backend directory: python -m pytest tests
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MAX_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS") or "3")
+MAX_RSS_MB = float(os.getenv("STARTUP_BUDGET_RSS_MB") or "250")
+
+# modules that must not be imported while the app boots; they belong in warm-up or
+# are only needed by providers that are not configured
+FORBIDDEN_MODULES = [
+    "torch",
+    "sentence_transformers",
+    "boto3",
+    "google.cloud.aiplatform",
+    "azure.search.documents",
+    "fitz",
+]
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+from chatbot_setup import create_chat_session
+create_chat_session()
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "seconds": elapsed,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "modules": sorted(sys.modules),
+}))
+"""
+
+
+@pytest.fixture(scope="module")
+def startup_report():
+    env = {
+        **os.environ,
+        "VECTOR_STORE_PROVIDER": os.getenv("VECTOR_STORE_PROVIDER") or "local",
+        "VECTOR_STORE_PATH": os.getenv("VECTOR_STORE_PATH") or "docs.json",
+        "VECTOR_STORE_FORMAT": os.getenv("VECTOR_STORE_FORMAT") or "json",
+    }
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND_DIR, env=env, check=True,
+        capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_startup_time_within_budget(startup_report):
+    assert startup_report["seconds"] <= MAX_SECONDS, \
+        f"startup took {startup_report['seconds']:.2f}s (budget {MAX_SECONDS:.2f}s)"
+
+
+def test_startup_rss_within_budget(startup_report):
+    assert startup_report["rss_mb"] <= MAX_RSS_MB, \
+        f"peak RSS {startup_report['rss_mb']:.0f}MB (budget {MAX_RSS_MB:.0f}MB)"
+
+
+def test_no_heavy_sdks_imported_at_startup(startup_report):
+    imported = set(startup_report["modules"])
+    assert [module for module in FORBIDDEN_MODULES if module in imported] == []
@@ -9,6 +9,8 @@ class AWSOpenSearchStore(VectorStore):
         self.index = os.getenv("AWS_OPENSEARCH_INDEX")
         self.client = boto3.client("opensearch")  # or opensearch-py for HTTP
 
-    def query(self, query: str, top_k: int = 5):
+    # query_batch uses the VectorStore default until this placeholder is replaced;
+    # the real implementation should embed all queries and send them through _msearch (one request body with a query per line)
+    def query(self, query: str, top_k: int = 5, filters=None, collection=None):
         # this is a placeholder, replace with actual embedding + vector search
         return [{"text": "Example result from AWS OpenSearch"}]
@@ -1,7 +1,55 @@
-from .base import VectorStore
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+from .base import BatchQueryResult, VectorStore
 from azure.search.documents import SearchClient
 from azure.core.credentials import AzureKeyCredential
 import os
+import re
+
+# range filter keys -> OData comparison operators
+ODATA_RANGE_OPERATORS = {"gte": "ge", "gt": "gt", "lte": "le", "lt": "lt"}
+FIELD_NAME = re.compile(r"^[A-Za-z][A-Za-z0-9_]*$")
+
+
+def odata_literal(value: Any) -> str:
+    """Render a filter value as an OData literal; strings are quoted with ' escaped as ''."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    raise ValueError(f"Unsupported filter value: {value!r}")
+
+
+def odata_filter(filters: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Translate request filters into an OData $filter expression.
+
+    Filter values come from the /chat request body, so field names are validated and every
+    value is rendered as an escaped literal rather than spliced into the expression.
+    """
+    clauses = []
+    for field, condition in (filters or {}).items():
+        if not FIELD_NAME.match(field):
+            raise ValueError(f"Invalid filter field: {field}")
+        if isinstance(condition, dict):
+            unknown = set(condition) - set(ODATA_RANGE_OPERATORS)
+            if unknown or not condition:
+                raise ValueError(f"Unsupported range filter on {field}: {condition}")
+            bounds = []
+            for key, bound in condition.items():
+                if isinstance(bound, bool) or not isinstance(bound, (int, float)):
+                    raise ValueError(f"Range filter bounds must be numbers: {field}")
+                bounds.append(f"{field} {ODATA_RANGE_OPERATORS[key]} {odata_literal(bound)}")
+            clauses.append("(" + " and ".join(bounds) + ")")
+        else:
+            values = condition if isinstance(condition, list) else [condition]
+            if not values:
+                raise ValueError(f"Empty membership filter: {field}")
+            clauses.append(
+                "(" + " or ".join(f"{field} eq {odata_literal(v)}" for v in values) + ")")
+    return " and ".join(clauses) or None
 
 
 class AzureAISearchStore(VectorStore):
@@ -9,9 +57,22 @@ class AzureAISearchStore(VectorStore):
         endpoint = os.getenv("AZURE_SEARCH_ENDPOINT")
         key = os.getenv("AZURE_SEARCH_KEY")
         index_name = os.getenv("AZURE_SEARCH_INDEX")
+        self.index_name = index_name
         self.client = SearchClient(
             endpoint=endpoint, index_name=index_name, credential=AzureKeyCredential(key))
 
-    def query(self, query: str, top_k: int = 5):
-        results = self.client.search(query)
+    def query(self, query: str, top_k: int = 5, filters=None, collection=None):
+        # the client is bound to a single index; other collections cannot be served
+        if collection not in (None, self.index_name):
+            raise ValueError(f"Unknown collection: {collection}")
+        results = self.client.search(
+            query, filter=odata_filter(filters), top=top_k)
         return [{"text": r["content"]} for r in results]
+
+    def query_batch(self, queries, top_k: int = 5, filters=None, collection=None):
+        # Azure AI Search has no multi-query endpoint; issue the searches concurrently
+        # over the client's shared connection pool instead of one after another
+        with ThreadPoolExecutor(max_workers=min(8, len(queries) or 1)) as pool:
+            results = list(pool.map(
+                lambda q: self.query(q, top_k, filters, collection), queries))
+        return BatchQueryResult.from_documents(results, top_k)
@@ -1,25 +1,131 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import Any, Callable, List, Dict, Optional
+import numpy as np
+
+
+class BatchQueryResult:
+    """
+    Result of a batched vector search.
+
+    `scores` and `ids` are (num_queries, top_k) arrays; an id of -1 marks an empty slot.
+    Documents are only materialized when requested through `documents`, so callers that
+    need just ids and scores (evaluation, warm-up) never build result dicts.
+    """
+
+    def __init__(self, scores: np.ndarray, ids: np.ndarray, resolve: Callable[[int], Dict[str, Any]]):
+        """
+        Args:
+            scores (np.ndarray): Similarity scores or distances, one row per query.
+            ids (np.ndarray): Store-specific integer document ids, one row per query.
+            resolve (Callable[[int], Dict[str, Any]]): Maps a document id to its record.
+        """
+        self.scores = scores
+        self.ids = ids
+        self._resolve = resolve
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def documents(self, row: int) -> List[Dict[str, Any]]:
+        """Resolve the documents matched by query number `row`, best match first."""
+        return [self._resolve(int(i)) for i in self.ids[row] if i >= 0]
+
+    @classmethod
+    def from_documents(cls, results: List[List[Dict[str, Any]]], top_k: int) -> "BatchQueryResult":
+        """
+        Wrap per-query document lists from a store without native id/score output.
+
+        Ids index into the flattened result lists and scores are NaN.
+        """
+        flat: List[Dict[str, Any]] = []
+        ids = np.full((len(results), top_k), -1, dtype="int64")
+        for row, docs in enumerate(results):
+            for col, doc in enumerate(docs[:top_k]):
+                ids[row, col] = len(flat)
+                flat.append(doc)
+        scores = np.where(ids >= 0, np.nan, np.inf).astype("float32")
+        return cls(scores, ids, flat.__getitem__)
 
 
 class VectorStore(ABC):
     """
     Abstract base class for vector store implementations
     """
+    def warm_up(self) -> None:
+        """
+        Perform expensive one-time initialization (model loading, index building).
+
+        Called from a background thread after the app starts so that worker boot is not
+        blocked. Stores that have nothing to prepare can rely on this no-op default.
+        """
+        pass
+
+    @property
+    def ready(self) -> bool:
+        """Whether the store has finished warming up and can serve queries."""
+        return True
+
+    def refresh(self) -> List[str]:
+        """
+        Re-index any corpus that changed on disk, swapping each new index in atomically.
+
+        Blocking; run it off the event loop. Stores whose index is managed by a remote
+        service have nothing to do and rely on this no-op default.
+
+        Returns:
+            Names of the collections that were re-indexed.
+        """
+        return []
+
     @abstractmethod
-    def query(self, query: str, top_k: int = 5) -> List[Dict[str, str]]:
+    def query(
+        self,
+        query: str,
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        collection: Optional[str] = None
+    ) -> List[Dict[str, str]]:
         """
         Perform a vector similarity search against the store. 
 
         Args: 
             query (str): The natural language query or embedding text.
             top_k (int): The number of top results to return.
+            filters (Optional[Dict[str, Any]]): Metadata field filters applied before ranking.
+                A scalar value means equality, a list means membership, and a dict with
+                "gte"/"gt"/"lte"/"lt" keys means a numeric range.
+            collection (Optional[str]): Named collection (or index) to search; store default if None.
 
         Returns:
             A list of matched records, typically including content and optional metadata fields.
         """
         pass
 
+    def query_batch(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        collection: Optional[str] = None
+    ) -> BatchQueryResult:
+        """
+        Run several similarity searches at once.
+
+        Stores should override this with a native multi-query call; the default runs
+        `query` once per input.
+
+        Args:
+            queries (List[str]): The natural language queries.
+            top_k (int): The number of top results to return per query.
+            filters (Optional[Dict[str, Any]]): Metadata filters applied to every query.
+            collection (Optional[str]): Named collection (or index) to search.
+
+        Returns:
+            A BatchQueryResult with one row per query.
+        """
+        return BatchQueryResult.from_documents(
+            [self.query(q, top_k, filters, collection) for q in queries], top_k)
+
 
 class DocumentLoader(ABC):
     """
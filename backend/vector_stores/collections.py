@@ -0,0 +1,332 @@
+import copy
+import os
+import json
+import fcntl
+import logging
+import threading
+import faiss  # https://ai.meta.com/tools/faiss/
+import numpy as np
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from vector_stores.base import BatchQueryResult, DocumentLoader
+from vector_stores.embedders.base import Embedder
+
+# storage precision -> FAISS scalar quantizer type; float32 uses an exact IndexFlatL2
+INDEX_QUANTIZERS = {
+    "float16": faiss.ScalarQuantizer.QT_fp16,
+    "int8": faiss.ScalarQuantizer.QT_8bit,
+}
+
+
+class MetadataTable:
+    """
+    Columnar side table holding every non-text document field.
+
+    Numeric fields are stored as one float64 array per column (NaN when missing). Other
+    fields are dictionary-encoded: an int32 code array plus the list of distinct values
+    (-1 when missing). Filters are evaluated as vectorized masks over these arrays.
+
+    List values are matched by membership: a filter value matches a document whose list
+    contains it. Fields holding objects cannot be filtered on.
+    """
+
+    def __init__(self, documents: List[Dict[str, Any]]):
+        self.size = len(documents)
+        self.numeric: Dict[str, np.ndarray] = {}
+        self.codes: Dict[str, np.ndarray] = {}
+        self.categories: Dict[str, List[Any]] = {}
+
+        columns = sorted({key for doc in documents for key in doc if key != "text"})
+        for column in columns:
+            values = [doc.get(column) for doc in documents]
+            numeric = self._as_numeric(values)
+            if numeric is not None:
+                self.numeric[column] = numeric
+                continue
+            # lists and dicts are unhashable, so distinct values are keyed by their JSON
+            lookup: Dict[Any, int] = {}
+            categories: List[Any] = []
+            codes = np.full(self.size, -1, dtype="int32")
+            for i, value in enumerate(values):
+                if value is None:
+                    continue
+                key = json.dumps(value, sort_keys=True) if isinstance(value, (dict, list)) else value
+                if key not in lookup:
+                    lookup[key] = len(categories)
+                    categories.append(value)
+                codes[i] = lookup[key]
+            self.codes[column] = codes
+            self.categories[column] = categories
+
+    @staticmethod
+    def _as_numeric(values: List[Any]) -> Optional[np.ndarray]:
+        # only real numbers: strings such as zip codes or versions ("02132", "1.10") stay categorical
+        present = [v for v in values if v is not None]
+        if not present or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+            return None
+        return np.array([np.nan if v is None else float(v) for v in values], dtype="float64")
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """Reconstruct the metadata fields of document i."""
+        fields: Dict[str, Any] = {}
+        for column, values in self.numeric.items():
+            if not np.isnan(values[i]):
+                value = values[i]
+                fields[column] = int(value) if value.is_integer() else float(value)
+        for column, codes in self.codes.items():
+            if codes[i] >= 0:
+                value = self.categories[column][codes[i]]
+                # a copy, so callers cannot change the value shared by every matching document
+                fields[column] = copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+        return fields
+
+    def select(self, filters: Dict[str, Any]) -> np.ndarray:
+        """
+        Return the ids of documents matching every filter.
+
+        Each filter value is either a scalar (equality), a list (membership) or a dict with
+        any of "gte", "gt", "lte", "lt" (range, numeric columns only). On a field holding
+        lists, a document matches when its list contains the value, or any of the values.
+
+        Raises:
+            ValueError: For a range filter on a non-numeric field, or any filter on a field
+                holding objects.
+        """
+        mask = np.ones(self.size, dtype=bool)
+        for column, condition in filters.items():
+            if column in self.numeric:
+                mask &= self._numeric_mask(self.numeric[column], condition)
+            elif column in self.codes:
+                mask &= self._category_mask(column, condition)
+            else:
+                # unknown column: nothing can match
+                return np.zeros(0, dtype="int64")
+        return np.flatnonzero(mask).astype("int64")
+
+    @staticmethod
+    def _numeric_mask(values: np.ndarray, condition: Any) -> np.ndarray:
+        if isinstance(condition, dict):
+            mask = ~np.isnan(values)
+            if "gte" in condition:
+                mask &= values >= float(condition["gte"])
+            if "gt" in condition:
+                mask &= values > float(condition["gt"])
+            if "lte" in condition:
+                mask &= values <= float(condition["lte"])
+            if "lt" in condition:
+                mask &= values < float(condition["lt"])
+            return mask
+        if isinstance(condition, list):
+            return np.isin(values, [float(c) for c in condition])
+        return values == float(condition)
+
+    def _category_mask(self, column: str, condition: Any) -> np.ndarray:
+        categories = self.categories[column]
+        if any(isinstance(value, dict) for value in categories):
+            raise ValueError(f"Filters are not supported on object field: {column}")
+        if isinstance(condition, dict):
+            raise ValueError(f"Range filters are not supported on non-numeric field: {column}")
+        wanted = condition if isinstance(condition, list) else [condition]
+        wanted_codes = [
+            code for code, value in enumerate(categories)
+            if (any(w in value for w in wanted) if isinstance(value, list) else value in wanted)
+        ]
+        return np.isin(self.codes[column], wanted_codes)
+
+
+class CollectionState(NamedTuple):
+    """
+    The index, texts and metadata of a loaded collection.
+
+    Immutable: a reload builds a new state and unloading drops the collection's reference,
+    so a search that holds a state is never affected by either.
+    """
+    index: faiss.Index
+    texts: List[str]
+    metadata: MetadataTable
+
+    def search_batch(
+        self,
+        query_vectors: np.ndarray,
+        top_k: int,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> BatchQueryResult:
+        """
+        Search the collection with a matrix of query vectors in a single FAISS call,
+        restricting candidates to documents that match `filters`.
+
+        Filters are resolved to an id set first and passed to FAISS as an IDSelector, so
+        the top_k results are the nearest matching documents rather than whatever survives
+        post-filtering an over-fetched result list.
+
+        Returns:
+            A BatchQueryResult of L2 distances (lower is closer) and document ids.
+        """
+        texts, metadata = self.texts, self.metadata
+
+        def resolve(i: int) -> Dict[str, Any]:
+            return {"text": texts[i], **metadata.row(i)}
+
+        params = None
+        if filters:
+            ids = metadata.select(filters)
+            if len(ids) == 0:
+                empty = np.full((len(query_vectors), top_k), -1, dtype="int64")
+                return BatchQueryResult(np.full(empty.shape, np.inf, dtype="float32"), empty, resolve)
+            params = faiss.SearchParameters(sel=faiss.IDSelectorBatch(ids))
+
+        # FAISS pads with -1 when fewer than top_k candidates exist
+        distances, indices = self.index.search(query_vectors, top_k, params=params)
+        return BatchQueryResult(distances, indices, resolve)
+
+
+class Collection:
+    """
+    A named corpus with its own FAISS index, documents and metadata table.
+
+    Collections are loaded on first use and can be unloaded to release memory; the
+    owning LocalFAISSStore decides when. The loaded data is held as one CollectionState
+    that is replaced in a single assignment, so a reload builds the new index off to the
+    side and searches never see a mix of old and new state.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loader: DocumentLoader,
+        path: str,
+        embedder: Embedder,
+        index_path: Optional[str] = None,
+        dtype: str = "float32"
+    ):
+        if dtype != "float32" and dtype not in INDEX_QUANTIZERS:
+            raise ValueError(f"Unsupported vector storage dtype: {dtype}")
+        self.name = name
+        self.loader = loader
+        self.path = path
+        self.embedder = embedder
+        self.index_path = index_path
+        self.dtype = dtype
+
+        self._state: Optional[CollectionState] = None
+        self._loaded_stat: Optional[Tuple[int, float]] = None
+        # serializes loads of this collection only; other collections keep serving
+        self._load_lock = threading.RLock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._state is not None
+
+    @property
+    def state(self) -> Optional[CollectionState]:
+        return self._state
+
+    def _corpus_stat(self) -> Optional[Tuple[int, float]]:
+        if not os.path.exists(self.path):
+            return None
+        stat = os.stat(self.path)
+        return (stat.st_size, stat.st_mtime)
+
+    @property
+    def corpus_changed(self) -> bool:
+        """Whether the corpus file changed since this collection was loaded."""
+        return self.loaded and self._corpus_stat() != self._loaded_stat
+
+    def ensure_loaded(self) -> CollectionState:
+        """Return the loaded state, loading it first if needed. Concurrent callers share one load."""
+        state = self._state
+        if state is not None:
+            return state
+        with self._load_lock:
+            return self._state or self.load()
+
+    def load(self) -> CollectionState:
+        """Read the documents and build or map the FAISS index, then swap them in.
+
+        Also used to reload: the current state keeps serving until the new one is ready.
+        """
+        with self._load_lock:
+            stat = self._corpus_stat()
+            documents = self.loader.load(self.path) if stat else []
+            source = os.path.basename(self.path)
+            for doc in documents:
+                doc.setdefault("source", source)
+            texts = [doc["text"] for doc in documents]
+            metadata = MetadataTable(documents)
+
+            if self.index_path:
+                index = self._load_shared_index(texts)
+            else:
+                index = self._build_index(texts)
+
+            state = CollectionState(index, texts, metadata)
+            self._state = state
+            self._loaded_stat = stat
+        logging.info(
+            f"Loaded collection '{self.name}' with {index.ntotal} vectors")
+        return state
+
+    def unload(self) -> None:
+        """Drop the index, texts and metadata so they can be garbage collected."""
+        self._state = None
+        self._loaded_stat = None
+        logging.info(f"Unloaded collection '{self.name}'")
+
+    def _build_index(self, texts: List[str]) -> faiss.Index:
+        """Encode all documents into a new index using the configured storage precision."""
+        dimension = self.embedder.dimension
+        if self.dtype in INDEX_QUANTIZERS:
+            index = faiss.IndexScalarQuantizer(
+                dimension, INDEX_QUANTIZERS[self.dtype], faiss.METRIC_L2)
+        else:
+            index = faiss.IndexFlatL2(dimension)
+        if texts:
+            vectors = self.embedder.encode(texts)
+            # int8 needs per-dimension ranges; float16 training is a no-op
+            if not index.is_trained:
+                index.train(vectors)
+            index.add(vectors)
+        return index
+
+    def _corpus_fingerprint(self, texts: List[str]) -> Dict[str, Any]:
+        stat = os.stat(self.path) if os.path.exists(self.path) else None
+        return {
+            "size": stat.st_size if stat else 0,
+            "mtime": stat.st_mtime if stat else 0,
+            "count": len(texts),
+            "embedder": self.embedder.model_id,
+            "dimension": self.embedder.dimension,
+            "dtype": self.dtype,
+        }
+
+    def _load_shared_index(self, texts: List[str]) -> faiss.Index:
+        """
+        Memory-map the persisted index, building it first if needed.
+
+        An exclusive file lock ensures that only the first worker to start encodes the corpus;
+        the others block on the lock and then map the finished file.
+        """
+        meta_path = f"{self.index_path}.meta.json"
+        fingerprint = self._corpus_fingerprint(texts)
+
+        with open(f"{self.index_path}.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                stale = True
+                if os.path.exists(self.index_path) and os.path.exists(meta_path):
+                    with open(meta_path, "r") as f:
+                        stale = json.load(f) != fingerprint
+
+                if stale:
+                    logging.info(f"Building FAISS index at {self.index_path}")
+                    index = self._build_index(texts)
+                    # write to a temp file and rename so readers never see a partial index
+                    tmp_path = f"{self.index_path}.tmp"
+                    faiss.write_index(index, tmp_path)
+                    os.replace(tmp_path, self.index_path)
+                    with open(meta_path, "w") as f:
+                        json.dump(fingerprint, f)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+        # IO_FLAG_MMAP only maps on-disk inverted lists; MMAP_IFC maps flat and scalar quantizer codes
+        return faiss.read_index(self.index_path, faiss.IO_FLAG_MMAP_IFC)
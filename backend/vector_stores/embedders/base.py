@@ -0,0 +1,40 @@
+from abc import ABC, abstractmethod
+from typing import List
+import numpy as np
+
+
+class Embedder(ABC):
+    """
+    Abstract base class for text embedding backends used by the local vector store.
+
+    Constructing an embedder must be cheap; model weights are loaded in `load`, which the
+    store calls from its background warm-up.
+    """
+    @abstractmethod
+    def load(self) -> None:
+        """Load model weights and any runtime session. Must be idempotent."""
+        pass
+
+    @property
+    @abstractmethod
+    def dimension(self) -> int:
+        """Dimensionality of the produced vectors."""
+        pass
+
+    @property
+    def model_id(self) -> str:
+        """Identifies the model; persisted indexes built with a different model are rebuilt."""
+        return type(self).__name__
+
+    @abstractmethod
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a list of texts.
+
+        Args:
+            texts (List[str]): The texts to embed.
+
+        Returns:
+            A float32 array of shape (len(texts), dimension), in input order.
+        """
+        pass
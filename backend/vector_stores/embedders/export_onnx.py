@@ -0,0 +1,44 @@
+"""
+Export a SentenceTransformers model to ONNX and quantize it to int8 for ONNXEmbedder.
+
+Usage:
+    python -m vector_stores.embedders.export_onnx --output models/all-MiniLM-L6-v2-onnx
+"""
+import argparse
+import os
+
+
+def export(model_name: str, output_dir: str) -> None:
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModel, AutoTokenizer
+
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name).eval()
+
+    # the fast tokenizer serializes to the tokenizer.json consumed by ONNXEmbedder
+    tokenizer.backend_tokenizer.save(os.path.join(output_dir, "tokenizer.json"))
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    fp32_path = os.path.join(output_dir, "model.onnx")
+    torch.onnx.export(
+        model,
+        (sample["input_ids"], sample["attention_mask"], sample["token_type_ids"]),
+        fp32_path,
+        input_names=["input_ids", "attention_mask", "token_type_ids"],
+        output_names=["last_hidden_state"],
+        dynamic_axes={name: {0: "batch", 1: "sequence"} for name in
+                      ["input_ids", "attention_mask", "token_type_ids", "last_hidden_state"]},
+        opset_version=14,
+    )
+    quantize_dynamic(fp32_path, os.path.join(output_dir, "model_quantized.onnx"),
+                     weight_type=QuantType.QInt8)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2")
+    parser.add_argument("--output", required=True)
+    args = parser.parse_args()
+    export(args.model, args.output)
@@ -0,0 +1,42 @@
+import os
+from typing import Optional
+from vector_stores.embedders.base import Embedder
+from vector_stores.factory import load_registered_class
+
+EMBEDDER_REGISTRY = {
+    "sentence-transformers": ("vector_stores.embedders.sentence_transformer", "SentenceTransformerEmbedder"),
+    "onnx": ("vector_stores.embedders.onnx_embedder", "ONNXEmbedder"),
+}
+
+
+def get_embedder(backend: Optional[str] = None) -> Embedder:
+    """
+    Factory method for creating an embedder from environment configuration.
+
+    Args:
+        backend (Optional[str]): 'sentence-transformers' (default) or 'onnx'.
+
+    Returns:
+        An instance of a class that implements Embedder. Weights are not loaded yet.
+    """
+    backend = (backend or "sentence-transformers").lower()
+    embedder_class = load_registered_class(
+        EMBEDDER_REGISTRY, backend, "embedding backend")
+    # empty values (ex. `EMBEDDING_THREADS=` in .env) mean unset
+    threads = os.getenv("EMBEDDING_THREADS")
+    inter_op_threads = os.getenv("EMBEDDING_INTER_OP_THREADS")
+    batch_size = int(os.getenv("EMBEDDING_BATCH_SIZE") or "32")
+
+    if backend == "onnx":
+        return embedder_class(
+            model_dir=os.getenv("EMBEDDING_MODEL_PATH") or "models/all-MiniLM-L6-v2-onnx",
+            model_file=os.getenv("EMBEDDING_ONNX_FILE") or "model_quantized.onnx",
+            batch_size=batch_size,
+            intra_op_threads=int(threads) if threads else None,
+            inter_op_threads=int(inter_op_threads) if inter_op_threads else None,
+        )
+    return embedder_class(
+        model_name=os.getenv("EMBEDDING_MODEL") or "all-MiniLM-L6-v2",
+        batch_size=batch_size,
+        num_threads=int(threads) if threads else None,
+    )
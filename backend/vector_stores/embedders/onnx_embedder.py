@@ -0,0 +1,122 @@
+import os
+from typing import List, Optional
+import numpy as np
+from vector_stores.embedders.base import Embedder
+
+
+class ONNXEmbedder(Embedder):
+    """
+    CPU embeddings through ONNX Runtime, typically with an int8 dynamically quantized model.
+
+    Expects a directory containing `tokenizer.json` and an ONNX export of the transformer
+    (see `python -m vector_stores.embedders.export_onnx`). Token embeddings are mean-pooled
+    and L2-normalized, matching the all-MiniLM-L6-v2 SentenceTransformers pipeline.
+
+    Texts are sorted by token length and grouped into batches of similar length, so each
+    batch is only padded to its own longest sequence rather than to the global maximum.
+    """
+
+    def __init__(
+        self,
+        model_dir: str,
+        model_file: str = "model_quantized.onnx",
+        batch_size: int = 32,
+        max_seq_length: int = 256,
+        intra_op_threads: Optional[int] = None,
+        inter_op_threads: Optional[int] = None
+    ):
+        """
+        Args:
+            model_dir (str): Directory with the ONNX model and tokenizer.json.
+            model_file (str): File name of the ONNX model inside model_dir.
+            batch_size (int): Maximum number of texts per inference call.
+            max_seq_length (int): Texts are truncated to this many tokens.
+            intra_op_threads (Optional[int]): Threads used inside a single operator; ORT default if None.
+            inter_op_threads (Optional[int]): Threads used across independent operators; ORT default if None.
+        """
+        self.model_dir = model_dir
+        self.model_file = model_file
+        self.batch_size = batch_size
+        self.max_seq_length = max_seq_length
+        self.intra_op_threads = intra_op_threads
+        self.inter_op_threads = inter_op_threads
+        self.session = None
+        self.tokenizer = None
+        self._input_names: List[str] = []
+        self._dimension: Optional[int] = None
+
+    def load(self) -> None:
+        if self.session is not None:
+            return
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.intra_op_threads:
+            options.intra_op_num_threads = self.intra_op_threads
+        if self.inter_op_threads:
+            options.inter_op_num_threads = self.inter_op_threads
+
+        self.session = ort.InferenceSession(
+            os.path.join(self.model_dir, self.model_file),
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self._input_names = [i.name for i in self.session.get_inputs()]
+
+        self.tokenizer = Tokenizer.from_file(
+            os.path.join(self.model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self.tokenizer.no_padding()
+
+        self._dimension = int(self.encode(["warm up"]).shape[1])
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    @property
+    def model_id(self) -> str:
+        return f"onnx:{os.path.join(self.model_dir, self.model_file)}"
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self._dimension or 0), dtype="float32")
+
+        encodings = self.tokenizer.encode_batch(texts)
+        # length-bucketed batching: neighbours in sorted order have similar lengths
+        order = np.argsort([len(e.ids) for e in encodings], kind="stable")
+        output = [None] * len(texts)
+
+        for start in range(0, len(order), self.batch_size):
+            batch_ids = order[start:start + self.batch_size]
+            batch = [encodings[i] for i in batch_ids]
+            vectors = self._run_batch(batch)
+            for i, vector in zip(batch_ids, vectors):
+                output[i] = vector
+
+        return np.stack(output).astype("float32")
+
+    def _run_batch(self, batch) -> np.ndarray:
+        seq_len = max(len(e.ids) for e in batch)
+        input_ids = np.zeros((len(batch), seq_len), dtype="int64")
+        attention_mask = np.zeros((len(batch), seq_len), dtype="int64")
+        type_ids = np.zeros((len(batch), seq_len), dtype="int64")
+        for row, e in enumerate(batch):
+            n = len(e.ids)
+            input_ids[row, :n] = e.ids
+            attention_mask[row, :n] = e.attention_mask
+            type_ids[row, :n] = e.type_ids
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask,
+                 "token_type_ids": type_ids}
+        token_embeddings = self.session.run(
+            None, {name: feeds[name] for name in self._input_names})[0]
+
+        # mean pooling over real tokens, then L2 normalization
+        mask = attention_mask[..., None].astype("float32")
+        pooled = (token_embeddings * mask).sum(axis=1) / \
+            np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return pooled / np.clip(norms, 1e-12, None)
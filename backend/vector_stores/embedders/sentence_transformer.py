@@ -0,0 +1,43 @@
+from typing import List, Optional
+import numpy as np
+from vector_stores.embedders.base import Embedder
+
+
+class SentenceTransformerEmbedder(Embedder):
+    """Full-precision PyTorch embeddings through SentenceTransformers (the original behavior)."""
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", batch_size: int = 32, num_threads: Optional[int] = None):
+        """
+        Args:
+            model_name (str): SentenceTransformers model name or path.
+            batch_size (int): Encoding batch size.
+            num_threads (Optional[int]): Limit for torch intra-op threads; torch default if None.
+        """
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.num_threads = num_threads
+        self.model = None
+
+    def load(self) -> None:
+        if self.model is not None:
+            return
+        # torch is only imported once the model is actually needed
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if self.num_threads:
+            torch.set_num_threads(self.num_threads)
+        self.model = SentenceTransformer(self.model_name)
+
+    @property
+    def dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    @property
+    def model_id(self) -> str:
+        return f"sentence-transformers:{self.model_name}"
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        vectors = self.model.encode(
+            texts, batch_size=self.batch_size, convert_to_numpy=True)
+        return np.asarray(vectors, dtype="float32")
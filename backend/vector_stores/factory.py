@@ -1,20 +1,43 @@
-from .aws_opensearch import AWSOpenSearchStore
-from .gcp_vertex import GCPVertexStore
-from .azure_ai_search import AzureAISearchStore
+import importlib
+from typing import Optional, Type
 from .base import DocumentLoader, VectorStore
-from .local_faiss import LocalFAISSStore
-from .loaders.json_loader import JSONLoader
-from .loaders.pdf_loader import PDFLoader
+from .embedders.base import Embedder
 
+# provider name -> (module, class); modules are imported only when their provider is selected,
+# so a deployment using the local store never pays for the boto3 / aiplatform / azure SDK imports
+VECTOR_STORE_REGISTRY = {
+    "local": ("vector_stores.local_faiss", "LocalFAISSStore"),
+    "aws": ("vector_stores.aws_opensearch", "AWSOpenSearchStore"),
+    "gcp": ("vector_stores.gcp_vertex", "GCPVertexStore"),
+    "azure": ("vector_stores.azure_ai_search", "AzureAISearchStore"),
+}
 
-def get_vector_store(provider: str, loader: DocumentLoader, path: str) -> VectorStore:
+
+def load_registered_class(registry: dict, name: str, kind: str) -> Type:
+    """
+    Import and return the class registered under `name`.
+
+    Raises:
+        ValueError: If `name` is not in the registry.
+    """
+    if name not in registry:
+        raise ValueError(f"Unsupported {kind}: {name}")
+    module_name, class_name = registry[name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def get_vector_store(
+    provider: str,
+    loader: DocumentLoader,
+    path: str,
+    index_path: Optional[str] = None,
+    embedder: Optional[Embedder] = None,
+    dtype: str = "float32",
+    max_active_collections: int = 4
+) -> VectorStore:
+    store_class = load_registered_class(
+        VECTOR_STORE_REGISTRY, provider, "vector store provider")
     if provider == "local":
-        return LocalFAISSStore(loader=loader, path=path)
-    elif provider == "aws":
-        return AWSOpenSearchStore()
-    elif provider == "gcp":
-        return GCPVertexStore()
-    elif provider == "azure":
-        return AzureAISearchStore()
-    else:
-        raise ValueError(f"Unsupported vector store provider: {provider}")
+        return store_class(loader=loader, path=path, index_path=index_path, embedder=embedder, dtype=dtype,
+                           max_active_collections=max_active_collections)
+    return store_class()
@@ -10,5 +10,7 @@ class GCPVertexStore(VectorStore):
         self.index = aiplatform.MatchingEngineIndex(
             endpoint=os.getenv("GCP_VECTOR_INDEX"))
 
-    def query(self, query: str, top_k: int = 5):
+    # query_batch uses the VectorStore default until this placeholder is replaced;
+    # the real implementation should embed all queries and send them through MatchingEngineIndexEndpoint.find_neighbors(queries=[...])
+    def query(self, query: str, top_k: int = 5, filters=None, collection=None):
         return [{"text": "Example result from GCP Vertex Vector Search"}]
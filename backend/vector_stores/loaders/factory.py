@@ -1,6 +1,11 @@
-from .json_loader import JSONLoader
-from .pdf_loader import PDFLoader
 from vector_stores.base import DocumentLoader
+from vector_stores.factory import load_registered_class
+
+# format -> (module, class); PyMuPDF is only imported when PDFs are actually loaded
+DOCUMENT_LOADER_REGISTRY = {
+    "json": ("vector_stores.loaders.json_loader", "JSONLoader"),
+    "pdf": ("vector_stores.loaders.pdf_loader", "PDFLoader"),
+}
 
 
 def get_document_loader(format: str) -> DocumentLoader:
@@ -14,9 +19,4 @@ def get_document_loader(format: str) -> DocumentLoader:
         An instance of a class that implements DocumentLoader.
     """
     format = format.lower()
-    if format == "json":
-        return JSONLoader()
-    elif format == "pdf":
-        return PDFLoader()
-    else:
-        raise ValueError(f"Unsupported document format: {format}")
+    return load_registered_class(DOCUMENT_LOADER_REGISTRY, format, "document format")()
@@ -8,5 +8,5 @@ class PDFLoader(DocumentLoader):
         with fitz.open(path) as pdf:
             for i, page in enumerate(pdf):
                 text = page.get_text()
-                documents.append({"text": text, "page": str(i)})
+                documents.append({"text": text, "page": i})
         return documents
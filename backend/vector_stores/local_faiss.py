@@ -1,76 +1,220 @@
-import os
-import json
-import faiss  # https://ai.meta.com/tools/faiss/
+import logging
+import threading
+from collections import OrderedDict
 import numpy as np
-from typing import List, Dict, Optional
-from sentence_transformers import SentenceTransformer
-from vector_stores.base import VectorStore, DocumentLoader
+from typing import Any, List, Dict, Optional
+from vector_stores.base import BatchQueryResult, VectorStore, DocumentLoader
+from vector_stores.collections import Collection, CollectionState
+from vector_stores.embedders.base import Embedder
+from vector_stores.embedders.sentence_transformer import SentenceTransformerEmbedder
 
 
 class LocalFAISSStore(VectorStore):
     """
-    Implements a local vector store using FAISS and SentenceTransformers. 
+    Implements a local vector store using FAISS and a pluggable embedder. 
 
-    This store uses a 384-dimensional embedding model to convert documents into dense vectors,
-    which are indexed in-memory using FAISS for fast similarity search. 
+    This store uses an embedding model (by default the 384-dimensional all-MiniLM-L6-v2 through
+    SentenceTransformers) to convert documents into dense vectors, which are indexed using FAISS
+    for fast similarity search. When an index path is given, the index is built once, written to
+    disk and memory-mapped read-only, so every worker on the host shares the same pages instead
+    of re-encoding the corpus and holding its own copy.
+
+    Documents are organized in named collections, each with its own index and metadata table.
+    The corpus at `path` becomes the "default" collection; further collections are registered
+    with `add_collection`, loaded on first query, and evicted least-recently-used once more
+    than `max_active_collections` are loaded.
+
+    Loading the model and the default collection happen in `warm_up`, not in the constructor,
+    so the app can start serving while the store is still being prepared.
     """
 
+    DEFAULT_COLLECTION = "default"
+
     def __init__(
         self,
         loader: DocumentLoader,
         path: str,
-        index_path: Optional[str] = None
+        index_path: Optional[str] = None,
+        embedder: Optional[Embedder] = None,
+        dtype: str = "float32",
+        max_active_collections: int = 4
     ):
         """
-        Initialize the FAISS index and loads documents using the provided loader. 
+        Configure the store. No model is loaded and no documents are read until `warm_up`.
 
         Args:
             loader (DocumentLoader): A loader implementation that supports extracting documents from JSON, PDF, TXT.
             data_path (str): Path to the input file or directory containing documents.
-            index_path (Optional[str]): Optional path to a prebuilt FAISS index (not used in-memory version).
+            index_path (Optional[str]): Optional path of a persisted FAISS index shared by all workers.
+                Built from the corpus if missing or stale, then memory-mapped read-only.
+            embedder (Optional[Embedder]): Embedding backend; defaults to SentenceTransformers all-MiniLM-L6-v2.
+            dtype (str): Vector storage precision in the index: 'float32', 'float16' or 'int8'.
+            max_active_collections (int): Number of collections kept loaded before cold ones are evicted.
         """
-        # 384-dim transformer-based embedding model
-        self.model = SentenceTransformer("all-MiniLM-L6-v2")
+        self.loader = loader
         self.index_path = index_path
         self.path = path
+        self.dtype = dtype
+        self.max_active_collections = max_active_collections
+
+        # embedding model, loaded in warm_up
+        self.embedder = embedder or SentenceTransformerEmbedder()
+
+        self.collections: Dict[str, Collection] = {}
+        # loaded collections in least- to most-recently-used order
+        self._active: "OrderedDict[str, Collection]" = OrderedDict()
+        self._collections_lock = threading.RLock()
+        if path:
+            self.add_collection(self.DEFAULT_COLLECTION, loader, path, index_path)
+
+        self._ready = threading.Event()
+        self._warm_up_lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def add_collection(
+        self,
+        name: str,
+        loader: DocumentLoader,
+        path: str,
+        index_path: Optional[str] = None
+    ) -> None:
+        """
+        Register a named collection. It is loaded lazily on its first query.
+
+        Args:
+            name (str): Collection name used in queries.
+            loader (DocumentLoader): Loader for the collection's corpus.
+            path (str): Path to the collection's corpus.
+            index_path (Optional[str]): Optional persisted, shared index for this collection.
+        """
+        with self._collections_lock:
+            if name in self.collections:
+                raise ValueError(f"Collection already exists: {name}")
+            self.collections[name] = Collection(
+                name, loader, path, self.embedder, index_path=index_path, dtype=self.dtype)
 
-        # FAISS index for L2 (Euclidean) similarity search
-        self.index = faiss.IndexFlatL2(384)
-        # stores raw documents in-memory
-        self.documents: List[Dict[str, str]] = []
+    def remove_collection(self, name: str) -> None:
+        """Unload and unregister a collection."""
+        with self._collections_lock:
+            collection = self.collections.pop(name, None)
+            if collection:
+                self._active.pop(name, None)
+                collection.unload()
 
-        if os.path.exists(self.path):
-            self.documents = loader.load(path)
+    def warm_up(self) -> None:
+        """Load the embedding model and the default collection."""
+        with self._warm_up_lock:
+            if self._ready.is_set():
+                return
+            self.embedder.load()
+            if self.DEFAULT_COLLECTION in self.collections:
+                self._get_collection(self.DEFAULT_COLLECTION)
+            self._ready.set()
+            logging.info("Local FAISS store ready")
 
-        if self.documents:
-            vectors = self.model.encode([doc["text"]
-                                        for doc in self.documents])
-            self.index.add(np.array(vectors).astype("float32"))
+    def refresh(self) -> List[str]:
+        """
+        Rebuild loaded collections whose corpus file changed. The old index keeps serving
+        queries while the new one is built, then is replaced in a single swap. Collections
+        that are not loaded pick up the new corpus on their next load.
+        """
+        with self._collections_lock:
+            changed = [c for c in self._active.values() if c.corpus_changed]
+
+        reloaded = []
+        for collection in changed:
+            logging.info(f"Corpus for collection '{collection.name}' changed; re-indexing")
+            collection.load()
+            reloaded.append(collection.name)
+            with self._collections_lock:
+                # evicted while re-indexing: do not keep the rebuilt index around
+                if collection.name not in self._active:
+                    collection.unload()
+        return reloaded
+
+    def _get_collection(self, name: str) -> CollectionState:
+        """
+        Return the state of a collection, loading it and evicting the coldest ones if needed.
 
-    def query(self, query: str, top_k: int = 5):
+        Callers search the returned state, which stays valid even if the collection is
+        evicted meanwhile. Loading happens outside the store lock, so queries against other
+        collections are not blocked while a corpus is encoded.
+        """
+        with self._collections_lock:
+            if name not in self.collections:
+                raise ValueError(f"Unknown collection: {name}")
+            collection = self.collections[name]
+            state = collection.state
+            if state is not None and name in self._active:
+                self._active.move_to_end(name)
+                return state
+
+        state = collection.ensure_loaded()
+
+        with self._collections_lock:
+            if self.collections.get(name) is collection:
+                self._active[name] = collection
+                self._active.move_to_end(name)
+                while len(self._active) > self.max_active_collections:
+                    _, cold = self._active.popitem(last=False)
+                    cold.unload()
+        return state
+
+    def query(
+        self,
+        query: str,
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        collection: Optional[str] = None
+    ):
         """
         Search for the top_k most similar documents based on vector similarity.
 
         Args:
             query (str): The natural language query string.
             top_k (int): The number of similar results to return.
+            filters (Optional[Dict[str, Any]]): Metadata filters, ex. {"source": "docs.json", "page": {"gte": 2, "lte": 5}}.
+            collection (Optional[str]): Collection to search; the default collection if None.
 
         Returns: 
-            A list of document dictionaries with similarity to the input query.
+            A list of document dictionaries (text plus metadata fields) with similarity to the input query.
+            Empty while the store is still warming up.
         """
-        # encode query into vector
-        query_vector = self.model.encode([query]).astype("float32")
+        if not self.ready:
+            logging.info("Local FAISS store still warming up; skipping retrieval")
+            return []
+
+        state = self._get_collection(collection or self.DEFAULT_COLLECTION)
 
         # return fallback if no documents are indexed
-        if self.index.ntotal == 0:
+        if state.index.ntotal == 0:
             return [{"text": "No documents indexed yet."}]
 
-        # perform vector similarity search
-        distances, indices = self.index.search(query_vector, top_k)
+        query_vectors = self.embedder.encode([query])
+        return state.search_batch(query_vectors, top_k, filters).documents(0)
+
+    def query_batch(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        collection: Optional[str] = None
+    ) -> BatchQueryResult:
+        """
+        Encode all queries in one model pass and run one FAISS search over the stacked matrix.
+
+        Returns:
+            A BatchQueryResult of L2 distances (lower is closer) and document ids; documents
+            are resolved lazily. All rows are empty while the store is still warming up.
+        """
+        if not self.ready:
+            logging.info("Local FAISS store still warming up; skipping retrieval")
+            empty = np.full((len(queries), top_k), -1, dtype="int64")
+            return BatchQueryResult(np.full(empty.shape, np.inf, dtype="float32"), empty, lambda i: {})
 
-        # retrieve documents by index
-        results = []
-        for i in indices[0]:
-            if i < len(self.documents):
-                results.append(self.documents[i])
-        return results
+        state = self._get_collection(collection or self.DEFAULT_COLLECTION)
+        query_vectors = self.embedder.encode(queries)
+        return state.search_batch(query_vectors, top_k, filters)
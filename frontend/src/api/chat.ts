@@ -1,3 +1,13 @@
+// one id per page load; the backend keys conversation history on it so any worker can serve the next turn
+// crypto.randomUUID is only available in secure contexts (HTTPS or localhost)
+const conversationId =
+  typeof crypto !== "undefined" && typeof crypto.randomUUID === "function"
+    ? crypto.randomUUID()
+    : `${Date.now().toString(36)}-${Array.from(
+        crypto.getRandomValues(new Uint8Array(16)),
+        (b) => b.toString(16).padStart(2, "0")
+      ).join("")}`;
+
 export async function fetchStreamedResponse(
   message: string,
   onData: (chunk: string) => void
@@ -5,7 +15,7 @@ export async function fetchStreamedResponse(
   const response = await fetch(`${import.meta.env.VITE_API_URL}/chat`, {
     method: "POST",
     headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({ message }),
+    body: JSON.stringify({ message, conversation_id: conversationId }),
   });
 
   if (!response.body) throw new Error("No response body");